@@ -15,16 +15,16 @@ import asyncio
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 # Import configuration and setup
-from config import BotConfig
+from config import CONFIG
 
 # Initialize configuration and logging
-BotConfig.setup_logging()
+CONFIG.setup_logging()
 logger = logging.getLogger(__name__)
 
 # Import bot modules
 from bot.warning_system import PersistentWarningSystem
 from bot.error_recovery import ErrorRecoverySystem, run_bot_with_recovery
-from bot.utils.code_detection import CodeDetector
+from bot.utils.code_detection import CodeDetector, get_ocr_version
 from bot.username_filter import UsernameFilter
 from bot.bot_controller import bot_controller
 from bot.error_handlers import ErrorHandlers
@@ -45,14 +45,14 @@ class ClassBot:
         
     def has_allowed_role(self, member):
         """Check if member has allowed role"""
-        if not BotConfig.ALLOWED_ROLE_NAME:
+        if not CONFIG.ALLOWED_ROLE_NAME:
             # If no specific role required, anyone with any role can post
             return len(member.roles) > 1  # More than just @everyone
-        return any(role.name == BotConfig.ALLOWED_ROLE_NAME for role in member.roles)
+        return any(role.name == CONFIG.ALLOWED_ROLE_NAME for role in member.roles)
     
     def has_admin_role(self, member):
         """Check if member has admin role"""
-        return any(role.name in BotConfig.ADMIN_ROLE_NAMES for role in member.roles)
+        return any(role.name in CONFIG.ADMIN_ROLE_NAMES for role in member.roles)
     
     async def warn_user(self, member, channel, reason):
         """Warn a user for posting code without permission"""
@@ -72,8 +72,8 @@ class ClassBot:
             embed.add_field(name="Reason", value=reason, inline=False)
             embed.add_field(name="Warning", value=f"This is warning #{warning_count}", inline=True)
             
-            if BotConfig.ALLOWED_ROLE_NAME:
-                embed.add_field(name="Required Role", value=BotConfig.ALLOWED_ROLE_NAME, inline=True)
+            if CONFIG.ALLOWED_ROLE_NAME:
+                embed.add_field(name="Required Role", value=CONFIG.ALLOWED_ROLE_NAME, inline=True)
             else:
                 embed.add_field(name="Required", value="Any role", inline=True)
             
@@ -112,10 +112,10 @@ class ClassBot:
             logger.info(f"Image warning sent to {member.display_name} - OCR unavailable")
             
             # Send to log channel
-            if BotConfig.LOG_CHANNEL_ID:
+            if CONFIG.LOG_CHANNEL_ID:
                 try:
-                    log_channel = self.bot.get_channel(BotConfig.LOG_CHANNEL_ID)
-                    if log_channel and channel.id != BotConfig.LOG_CHANNEL_ID:
+                    log_channel = self.bot.get_channel(CONFIG.LOG_CHANNEL_ID)
+                    if log_channel and channel.id != CONFIG.LOG_CHANNEL_ID:
                         log_embed = discord.Embed(
                             title="🖼️ Image Posted - OCR Unavailable",
                             description=f"User {member.mention} posted image in {channel.mention}",
@@ -135,7 +135,7 @@ def main():
     """Main bot initialization and startup"""
     
     # Validate configuration
-    config_errors = BotConfig.validate_config()
+    config_errors = CONFIG.validate_config()
     if config_errors:
         logger.error("Configuration errors found:")
         for error in config_errors:
@@ -149,7 +149,7 @@ def main():
 
     # Create bot instance
     bot = commands.Bot(
-        command_prefix=BotConfig.COMMAND_PREFIX, 
+        command_prefix=CONFIG.COMMAND_PREFIX, 
         intents=intents, 
         help_command=None
     )
@@ -157,6 +157,11 @@ def main():
     # Initialize systems
     warning_system = PersistentWarningSystem()
     code_detector = CodeDetector()
+    
+    # Probe Tesseract now, before the event loop runs, so the first status or image
+    # check reads the cached version instead of starting a subprocess in a handler
+    logger.info(f"Tesseract version: {get_ocr_version() or 'unavailable'}")
+    
     error_recovery = ErrorRecoverySystem(bot, warning_system)
     username_filter = UsernameFilter()
     
@@ -165,11 +170,11 @@ def main():
 
     # Initialize assignment system
     assignment_manager = AssignmentManager()
-    assignment_commands = AssignmentCommands(bot, assignment_manager, BotConfig.ADMIN_ROLE_NAMES)
+    assignment_commands = AssignmentCommands(bot, assignment_manager, CONFIG.ADMIN_ROLE_NAMES)
     assignment_reminder_system = AssignmentReminderSystem(bot, assignment_manager)
 
     # Initialize and setup error handlers
-    error_handlers = ErrorHandlers(bot, class_bot, BotConfig.LOG_CHANNEL_ID)
+    error_handlers = ErrorHandlers(bot, class_bot, CONFIG.LOG_CHANNEL_ID)
     
     # Initialize and setup event handlers
     bot_events = BotEvents(
@@ -180,16 +185,16 @@ def main():
     # Initialize and setup commands
     bot_commands = BotCommands(
         bot, class_bot, username_filter, bot_controller, 
-        assignment_commands, BotConfig.ADMIN_ROLE_NAMES, BotConfig.LOG_CHANNEL_ID
+        assignment_commands, CONFIG.ADMIN_ROLE_NAMES, CONFIG.LOG_CHANNEL_ID
     )
 
     logger.info("Bot initialization complete")
     
     # Start the bot with error recovery
-    return run_bot_with_recovery(bot, BotConfig.TOKEN, warning_system)
+    return run_bot_with_recovery(bot, CONFIG.TOKEN, warning_system, code_detector)
 
 if __name__ == "__main__":
-    if not BotConfig.TOKEN:
+    if not CONFIG.TOKEN:
         print("ERROR: Discord token not found. Please check your .env file.")
         sys.exit(1)
     else:
@@ -0,0 +1,19 @@
+#!/bin/bash
+
+# Static check that the "no assignments" messages keep their expected text
+# Runs from pre-commit; usage: scripts/check_assignment_strings.sh [file]
+
+STRINGS_FILE="$(dirname "$0")/check_assignment_strings.txt"
+TARGET="${1:-src/bot/assignment_commands.py}"
+
+missing=0
+while IFS= read -r expected; do
+    # Skip blank lines and comments
+    [[ -z "$expected" || "$expected" == \#* ]] && continue
+    if ! grep -qF -- "$expected" "$TARGET"; then
+        echo "❌ Missing from $TARGET: '$expected'"
+        missing=1
+    fi
+done < "$STRINGS_FILE"
+
+exit $missing
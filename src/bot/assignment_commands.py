@@ -12,6 +12,28 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# Date parsing patterns, compiled once and tried in order
+TIME_PATTERNS = (
+    re.compile(r'(\d{1,2}):(\d{2})\s*(am|pm)'),  # 11:59pm, 2:30am
+    re.compile(r'(\d{1,2})\s*(am|pm)'),          # 11pm, 2am
+    re.compile(r'(\d{1,2}):(\d{2})'),            # 23:59, 14:30
+)
+
+DATE_PATTERNS = (
+    re.compile(r'(\d{1,2})/(\d{1,2})'),          # 12/15, 1/5
+    re.compile(r'(\w+)\s+(\d{1,2})'),            # Jan 15, January 15
+    re.compile(r'(\d{1,2})\s+(\w+)'),            # 15 Jan, 15 January
+)
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2,
+    'mar': 3, 'march': 3, 'apr': 4, 'april': 4,
+    'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
+    'aug': 8, 'august': 8, 'sep': 9, 'september': 9,
+    'oct': 10, 'october': 10, 'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12
+}
+
 class AssignmentCommands(commands.Cog):
     """Commands for managing assignments and Discord events."""
     
@@ -44,17 +66,11 @@ class AssignmentCommands(commands.Cog):
                 time_part = date_string
             
             # Extract time if present
-            time_patterns = [
-                r'(\d{1,2}):(\d{2})\s*(am|pm)',  # 11:59pm, 2:30am
-                r'(\d{1,2})\s*(am|pm)',          # 11pm, 2am
-                r'(\d{1,2}):(\d{2})',            # 23:59, 14:30
-            ]
-            
             hour = 23
             minute = 59
             
-            for pattern in time_patterns:
-                match = re.search(pattern, time_part)
+            for pattern in TIME_PATTERNS:
+                match = pattern.search(time_part)
                 if match:
                     if len(match.groups()) == 3:  # with am/pm
                         hour = int(match.group(1))
@@ -82,14 +98,8 @@ class AssignmentCommands(commands.Cog):
                 return base_date.replace(hour=hour, minute=minute, second=0, microsecond=0)
             
             # Try common date formats
-            date_patterns = [
-                r'(\d{1,2})/(\d{1,2})',          # 12/15, 1/5
-                r'(\w+)\s+(\d{1,2})',            # Jan 15, January 15
-                r'(\d{1,2})\s+(\w+)',            # 15 Jan, 15 January
-            ]
-            
-            for pattern in date_patterns:
-                match = re.search(pattern, date_string)
+            for pattern in DATE_PATTERNS:
+                match = pattern.search(date_string)
                 if match:
                     if '/' in match.group(0):
                         month = int(match.group(1))
@@ -102,20 +112,11 @@ class AssignmentCommands(commands.Cog):
                         return datetime(year, month, day, hour, minute)
                     else:
                         # Handle month names
-                        months = {
-                            'jan': 1, 'january': 1, 'feb': 2, 'february': 2,
-                            'mar': 3, 'march': 3, 'apr': 4, 'april': 4,
-                            'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7,
-                            'aug': 8, 'august': 8, 'sep': 9, 'september': 9,
-                            'oct': 10, 'october': 10, 'nov': 11, 'november': 11,
-                            'dec': 12, 'december': 12
-                        }
-                        
                         month_str = match.group(1).lower() if match.group(1).isalpha() else match.group(2).lower()
                         day_str = match.group(2) if match.group(1).isalpha() else match.group(1)
                         
-                        if month_str in months:
-                            month = months[month_str]
+                        if month_str in MONTHS:
+                            month = MONTHS[month_str]
                             day = int(day_str)
                             year = current_time.year
                             # If the date has passed this year, assume next year
@@ -195,21 +195,14 @@ class BotController:
             main_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
             sys.path.insert(0, os.path.join(main_dir, 'src'))
             
-            from bot.utils.code_detection import CodeDetector
+            from bot.utils.code_detection import CodeDetector, get_ocr_version
             
             # Create a temporary detector to check OCR status
             detector = CodeDetector()
             ocr_available = detector.is_ocr_available()
             
-            # Try to get version information if available
-            version_info = "Unknown"
-            if ocr_available:
-                try:
-                    import pytesseract
-                    version_info = str(pytesseract.get_tesseract_version())
-                except Exception as e:
-                    version_info = "Available (version check failed)"
-                    logger.debug(f"OCR version check failed: {e}")
+            # OCR is only reported available once Tesseract has answered the cached version check
+            version_info = str(get_ocr_version()) if ocr_available else "Unknown"
             
             return {
                 "available": ocr_available,
@@ -38,7 +38,7 @@ class ErrorRecoverySystem:
             
             try:
                 # Save warnings before potential restart
-                self.warning_system.save_warnings()
+                await self.warning_system.save_warnings_async()
                 logger.info("Saved warnings before reconnection attempt")
                 
                 # The bot will automatically try to reconnect
@@ -59,41 +59,50 @@ class ErrorRecoverySystem:
         self.reconnect_attempts = 0
 
 
-async def run_bot_with_recovery(bot, token, warning_system):
+async def run_bot_with_recovery(bot, token, warning_system, code_detector=None):
     """Run bot with enhanced error recovery and automatic restart"""
     max_restarts = 5
     restart_count = 0
     
-    while restart_count < max_restarts:
-        try:
-            logger.info(f"Starting bot (attempt {restart_count + 1}/{max_restarts})")
-            
-            # Ensure warnings are saved before starting
-            warning_system.save_warnings()
+    try:
+        while restart_count < max_restarts:
+            try:
+                logger.info(f"Starting bot (attempt {restart_count + 1}/{max_restarts})")
+                
+                # Ensure warnings are saved before starting
+                await warning_system.save_warnings_async()
+                
+                await bot.start(token)
+                
+            except discord.LoginFailure:
+                logger.critical("Invalid Discord token - cannot start bot")
+                break
+            except discord.ConnectionClosed:
+                logger.error("Discord connection closed - attempting restart")
+            except discord.HTTPException as e:
+                logger.error(f"Discord HTTP error: {e} - attempting restart")
+            except Exception as e:
+                logger.error(f"Unexpected error: {e} - attempting restart", exc_info=True)
             
-            await bot.start(token)
+            # Save warnings before restart
+            try:
+                await warning_system.save_warnings_async()
+                logger.info("Saved warnings before restart")
+            except Exception as e:
+                logger.error(f"Failed to save warnings before restart: {e}")
+                
+            # Drop the image download session; the detector opens a new one on demand
+            if code_detector is not None:
+                await code_detector.close()
             
-        except discord.LoginFailure:
-            logger.critical("Invalid Discord token - cannot start bot")
-            break
-        except discord.ConnectionClosed:
-            logger.error("Discord connection closed - attempting restart")
-        except discord.HTTPException as e:
-            logger.error(f"Discord HTTP error: {e} - attempting restart")
-        except Exception as e:
-            logger.error(f"Unexpected error: {e} - attempting restart", exc_info=True)
-        
-        # Save warnings before restart
-        try:
-            warning_system.save_warnings()
-            logger.info("Saved warnings before restart")
-        except Exception as e:
-            logger.error(f"Failed to save warnings before restart: {e}")
-        
-        restart_count += 1
-        if restart_count < max_restarts:
-            delay = min(30, 5 * restart_count)  # Exponential backoff, max 30 seconds
-            logger.info(f"Restarting in {delay} seconds... (attempt {restart_count + 1}/{max_restarts})")
-            await asyncio.sleep(delay)
-        else:
-            logger.critical(f"Maximum restart attempts ({max_restarts}) reached - stopping bot")
\ No newline at end of file
+            restart_count += 1
+            if restart_count < max_restarts:
+                delay = min(30, 5 * restart_count)  # Exponential backoff, max 30 seconds
+                logger.info(f"Restarting in {delay} seconds... (attempt {restart_count + 1}/{max_restarts})")
+                await asyncio.sleep(delay)
+            else:
+                logger.critical(f"Maximum restart attempts ({max_restarts}) reached - stopping bot")
+    finally:
+        if code_detector is not None:
+            await code_detector.close()
+        warning_system.close()
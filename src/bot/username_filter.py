@@ -5,10 +5,54 @@ Detects inappropriate usernames with configurable sensitivity and minimal false
 import re
 import json
 import os
+import bisect
+import itertools
+import functools
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
 import logging
 
+from bot.utils.multi_pattern import build_hyperscan_database, compile_pattern, scan_pattern_ids
+
+# L33t speak alternatives for each letter, keyed by byte value so variants can be
+# written straight into a bytearray
+LEET_ALT = {
+    ord('a'): b'@4',
+    ord('e'): b'3',
+    ord('i'): b'1!',
+    ord('o'): b'0',
+    ord('s'): b'5$',
+    ord('t'): b'7',
+    ord('b'): b'8',
+    ord('l'): b'1',
+    ord('g'): b'9',
+    ord('u'): b'v',
+    ord('c'): b'(',
+}
+
+# Upper bound on l33t variants generated per word
+MAX_LEET_VARIANTS = 32
+
+# Number of normalized usernames whose scan results are cached per filter
+USERNAME_CACHE_SIZE = 4096
+
+# Joins names for batch scanning; no pattern can match across it
+BATCH_SEPARATOR = '\x01'
+
+# Match types produced by the evasion-pattern regexes
+PATTERN_MATCH_TYPES = ("basic_match", "leet_speak", "spaced_evasion", "repeat_chars", "backwards")
+
+# Attributes produced by UsernameFilter._compile_patterns
+COMPILED_ATTRIBUTES = (
+    "compiled_patterns", "replacements", "_word_to_category", "_min_word_len", "_match_weights",
+    "basic_patterns", "leet_patterns", "spaced_patterns", "repeat_patterns", "backwards_patterns",
+    "basic_regex", "leet_regex", "spaced_regex", "repeat_regex", "backwards_regex", "hs_database",
+)
+
+# Compiled pattern bundles shared by every filter in the process, keyed by the
+# word lists and pattern options they are compiled from
+_PATTERN_CACHE: Dict[Tuple, Dict] = {}
+
 class UsernameFilter:
     def __init__(self, config_path: str = "config/username_filter.json"):
         """Initialize the username filter with configuration."""
@@ -21,6 +65,10 @@ class UsernameFilter:
         # Compile regex patterns for performance
         self._compile_patterns()
         
+        # Scan results depend only on the normalized name, so repeated names
+        # (e.g. raid waves of identical joiners) are answered from the cache
+        self._check_username_cached = functools.lru_cache(maxsize=USERNAME_CACHE_SIZE)(self._scan_username)
+        
     def _load_config(self) -> Dict:
         """Load filter configuration from JSON file."""
         default_config = {
@@ -80,8 +128,29 @@ class UsernameFilter:
             return default_config
     
     def _compile_patterns(self):
+        """Compile regex patterns, reusing another filter's if it has the same word lists and options."""
+        cache_key = self._pattern_cache_key()
+        cached = _PATTERN_CACHE.get(cache_key)
+        if cached is not None:
+            self.__dict__.update(cached)
+            return
+        
+        self._build_patterns()
+        _PATTERN_CACHE[cache_key] = {name: getattr(self, name) for name in COMPILED_ATTRIBUTES}
+    
+    def _pattern_cache_key(self) -> Tuple:
+        """Identify the settings the patterns are compiled from.
+        
+        Word order is kept, since the first category listing a word is the one reported.
+        """
+        word_lists = tuple((category, tuple(words)) for category, words in self.config["word_lists"].items())
+        return word_lists, tuple(sorted(self.config["patterns"].items()))
+    
+    def _build_patterns(self):
         """Compile regex patterns for efficient matching."""
         self.compiled_patterns = {}
+        self.replacements = {}
+        self.basic_regex = self.leet_regex = self.spaced_regex = self.repeat_regex = self.backwards_regex = None
         
         # Character replacement patterns (l33t speak)
         if self.config["patterns"]["character_replacement"]:
@@ -91,15 +160,25 @@ class UsernameFilter:
             }
             self.replacements = replacements
         
-        # All inappropriate words combined
-        all_words = []
-        for word_list in self.config["word_lists"].values():
-            all_words.extend(word_list)
+        # Unique inappropriate words, tagged with the first category that lists them
+        self._word_to_category: Dict[str, str] = {}
+        for category, words in self.config["word_lists"].items():
+            for word in words:
+                self._word_to_category.setdefault(word.lower(), category)
+        
+        # Names shorter than the shortest word can never match any pattern
+        self._min_word_len = min((len(word) for word in self._word_to_category), default=0)
+        
+        # Confidence contribution of every match type, so scoring is a table lookup
+        match_types = list(PATTERN_MATCH_TYPES)
+        for category in self.config["word_lists"]:
+            match_types.extend((category, f"{category}_partial"))
+        self._match_weights = {match_type: self._match_weight(match_type) for match_type in match_types}
         
         # Create regex patterns for each detection method
-        self._create_word_patterns(all_words)
+        self._create_word_patterns()
     
-    def _create_word_patterns(self, words: List[str]):
+    def _create_word_patterns(self):
         """Create regex patterns for word detection."""
         # Separate patterns for different detection methods
         self.basic_patterns = []
@@ -108,7 +187,7 @@ class UsernameFilter:
         self.repeat_patterns = []
         self.backwards_patterns = []
         
-        for word in words:
+        for word in self._word_to_category:
             # Basic pattern - both exact match and partial match for longer words
             self.basic_patterns.append(rf'\b{re.escape(word)}\b')  # Exact word
             if len(word) >= 4:  # Partial matches for longer words
@@ -138,44 +217,39 @@ class UsernameFilter:
                     self.backwards_patterns.append(backwards)
         
         # Compile individual pattern groups
-        self.basic_regex = re.compile('|'.join(self.basic_patterns), re.IGNORECASE) if self.basic_patterns else None
-        self.leet_regex = re.compile('|'.join(self.leet_patterns), re.IGNORECASE) if self.leet_patterns else None
-        self.spaced_regex = re.compile('|'.join(self.spaced_patterns), re.IGNORECASE) if self.spaced_patterns else None
-        self.repeat_regex = re.compile('|'.join(self.repeat_patterns), re.IGNORECASE) if self.repeat_patterns else None
-        self.backwards_regex = re.compile('|'.join(self.backwards_patterns), re.IGNORECASE) if self.backwards_patterns else None
+        self.basic_regex = compile_pattern('|'.join(self.basic_patterns), re.IGNORECASE) if self.basic_patterns else None
+        self.leet_regex = compile_pattern('|'.join(self.leet_patterns), re.IGNORECASE) if self.leet_patterns else None
+        self.spaced_regex = compile_pattern('|'.join(self.spaced_patterns), re.IGNORECASE) if self.spaced_patterns else None
+        self.repeat_regex = compile_pattern('|'.join(self.repeat_patterns), re.IGNORECASE) if self.repeat_patterns else None
+        self.backwards_regex = compile_pattern('|'.join(self.backwards_patterns), re.IGNORECASE) if self.backwards_patterns else None
+        
+        # Optional Hyperscan prefilter over every individual pattern (None when unavailable)
+        self.hs_database = build_hyperscan_database(
+            self.basic_patterns + self.leet_patterns + self.spaced_patterns +
+            self.repeat_patterns + self.backwards_patterns
+        )
     
     def _create_leet_variations(self, word: str) -> List[str]:
         """Create l33t speak variations of a word."""
-        variations = []
-        
-        # Define character mappings
-        leet_map = {
-            'a': ['a', '@', '4'],
-            'e': ['e', '3'],
-            'i': ['i', '1', '!'],
-            'o': ['o', '0'],
-            's': ['s', '5', '$'],
-            't': ['t', '7'],
-            'b': ['b', '8'],
-            'l': ['l', '1'],
-            'g': ['g', '9'],
-            'u': ['u', 'v'],
-            'c': ['c', '('],
-        }
-        
-        # Generate a few key variations instead of all combinations
-        # This prevents regex complexity while catching common patterns
-        variations.append(re.escape(word))  # Original
-        
-        # Common single replacements
-        for char, replacements in leet_map.items():
-            if char in word.lower():
-                for replacement in replacements[1:]:  # Skip original character
-                    leet_version = word.lower().replace(char, replacement)
-                    variations.append(re.escape(leet_version))
-                    # Also add partial match for longer words
-                    if len(word) >= 4:
-                        variations.append(re.escape(leet_version))
+        word = word.lower()
+        variations = [re.escape(word)]  # Original
+        if not word.isascii():
+            return variations
+        
+        base = word.encode('ascii')
+        positions = [i for i, char in enumerate(base) if char in LEET_ALT]
+        
+        # Enumerate substitutions fewest-first so single-character evasions
+        # (fuck -> fvck) are always covered before the variant cap is reached
+        for count in range(1, len(positions) + 1):
+            for chosen in itertools.combinations(positions, count):
+                for replacements in itertools.product(*(LEET_ALT[base[i]] for i in chosen)):
+                    variant = bytearray(base)
+                    for index, replacement in zip(chosen, replacements):
+                        variant[index] = replacement
+                    variations.append(re.escape(variant.decode('ascii')))
+                    if len(variations) >= MAX_LEET_VARIANTS:
+                        return variations
         
         return variations
     
@@ -190,59 +264,74 @@ class UsernameFilter:
         Returns:
             Tuple of (is_inappropriate, details_dict)
         """
-        if not self.config["enabled"]:
-            return False, {"reason": "Filter disabled"}
-        
-        # Check whitelist
-        if username.lower() in [w.lower() for w in self.config["whitelist"]]:
-            return False, {"reason": "Whitelisted username"}
-        
         # Clean username for analysis
         clean_username = self._clean_username(username)
+        whitelist = {w.lower() for w in self.config["whitelist"]}
         
-        # Check for inappropriate content using different pattern types
-        matches = []
+        early_result = self._early_result(username, clean_username, whitelist)
+        if early_result is not None:
+            return early_result
         
-        # Basic pattern matching
-        if hasattr(self, 'basic_regex') and self.basic_regex:
-            basic_matches = self.basic_regex.findall(clean_username.lower())
-            matches.extend([("basic_match", match) for match in basic_matches if match])
+        # Matches are cached per normalized name
+        matches = list(self._check_username_cached(clean_username.lower()))
+        return self._build_result(username, clean_username, matches)
+    
+    def check_usernames(self, usernames: List[str]) -> List[Tuple[bool, Dict]]:
+        """
+        Check many usernames at once, e.g. when auditing every guild member.
         
-        # L33t speak matching
-        if hasattr(self, 'leet_regex') and self.leet_regex:
-            leet_matches = self.leet_regex.findall(clean_username.lower())
-            matches.extend([("leet_speak", match) for match in leet_matches if match])
+        The evasion-pattern regexes run once over a single buffer holding all
+        names rather than once per name.
         
-        # Spaced character matching
-        if hasattr(self, 'spaced_regex') and self.spaced_regex:
-            spaced_matches = self.spaced_regex.findall(clean_username.lower())
-            matches.extend([("spaced_evasion", match) for match in spaced_matches if match])
+        Args:
+            usernames: The usernames to check
+            
+        Returns:
+            List of (is_inappropriate, details_dict) in the same order as usernames
+        """
+        results: List[Optional[Tuple[bool, Dict]]] = [None] * len(usernames)
+        whitelist = {w.lower() for w in self.config["whitelist"]}
+        
+        # Group names that still need scanning by their normalized form
+        pending: Dict[str, List[Tuple[int, str, str]]] = {}
+        for index, username in enumerate(usernames):
+            clean_username = self._clean_username(username)
+            early_result = self._early_result(username, clean_username, whitelist)
+            if early_result is not None:
+                results[index] = early_result
+            else:
+                pending.setdefault(clean_username.lower(), []).append((index, username, clean_username))
         
-        # Repeated character matching
-        if hasattr(self, 'repeat_regex') and self.repeat_regex:
-            repeat_matches = self.repeat_regex.findall(clean_username.lower())
-            matches.extend([("repeat_chars", match) for match in repeat_matches if match])
+        if not pending:
+            return results
         
-        # Backwards matching
-        if hasattr(self, 'backwards_regex') and self.backwards_regex:
-            backwards_matches = self.backwards_regex.findall(clean_username.lower())
-            matches.extend([("backwards", match) for match in backwards_matches if match])
+        clean_names = list(pending)
+        pattern_matches = self._find_pattern_matches_batch(clean_names)
         
-        # Additional severity-based checks
-        severity_matches = self._check_severity(clean_username)
-        matches.extend(severity_matches)
+        for clean_lower, found in zip(clean_names, pattern_matches):
+            found.extend(self._check_severity(clean_lower))
+            matches = list(dict.fromkeys(found))
+            for index, username, clean_username in pending[clean_lower]:
+                results[index] = self._build_result(username, clean_username, list(matches))
         
-        # Remove duplicates while preserving order
-        unique_matches = []
-        seen = set()
-        for match in matches:
-            match_key = (match[0], match[1])
-            if match_key not in seen:
-                unique_matches.append(match)
-                seen.add(match_key)
+        return results
+    
+    def _early_result(self, username: str, clean_username: str, whitelist: set) -> Optional[Tuple[bool, Dict]]:
+        """Return a result for usernames that need no pattern scan, otherwise None."""
+        if not self.config["enabled"]:
+            return False, {"reason": "Filter disabled"}
         
-        matches = unique_matches
+        # Check whitelist
+        if username.lower() in whitelist:
+            return False, {"reason": "Whitelisted username"}
+        
+        if len(clean_username) < self._min_word_len:
+            return False, {"reason": "Username too short"}
         
+        return None
+    
+    def _build_result(self, username: str, clean_username: str, matches: List[Tuple[str, str]]) -> Tuple[bool, Dict]:
+        """Build the (is_inappropriate, details_dict) result for a scanned username."""
         # Determine if inappropriate
         is_inappropriate = len(matches) > 0
         
@@ -262,6 +351,83 @@ class UsernameFilter:
         
         return is_inappropriate, result
     
+    def _scan_username(self, clean_lower: str) -> Tuple[Tuple[str, str], ...]:
+        """Find all unique matches for a cleaned, lowercased username."""
+        # Check for inappropriate content using different pattern types,
+        # skipping the regex sweep when the prefilter rules out every pattern
+        matches = []
+        if self._prefilter_matches(clean_lower):
+            matches.extend(self._find_pattern_matches(clean_lower))
+        
+        # Additional severity-based checks
+        matches.extend(self._check_severity(clean_lower))
+        
+        # Remove duplicates while preserving order
+        return tuple(dict.fromkeys(matches))
+    
+    def _prefilter_matches(self, clean_lower: str) -> bool:
+        """Use the Hyperscan prefilter, when available, to skip the regex sweep."""
+        if self.hs_database is None:
+            return True
+        
+        matched_ids = scan_pattern_ids(self.hs_database, clean_lower)
+        return matched_ids is None or bool(matched_ids)
+    
+    def _find_pattern_matches(self, clean_lower: str) -> List[Tuple[str, str]]:
+        """Run each evasion-pattern regex against the cleaned, lowercased username."""
+        matches = []
+        
+        # Basic pattern matching
+        if self.basic_regex:
+            basic_matches = self.basic_regex.findall(clean_lower)
+            matches.extend([("basic_match", match) for match in basic_matches if match])
+        
+        # L33t speak matching
+        if self.leet_regex:
+            leet_matches = self.leet_regex.findall(clean_lower)
+            matches.extend([("leet_speak", match) for match in leet_matches if match])
+        
+        # Spaced character matching
+        if self.spaced_regex:
+            spaced_matches = self.spaced_regex.findall(clean_lower)
+            matches.extend([("spaced_evasion", match) for match in spaced_matches if match])
+        
+        # Repeated character matching
+        if self.repeat_regex:
+            repeat_matches = self.repeat_regex.findall(clean_lower)
+            matches.extend([("repeat_chars", match) for match in repeat_matches if match])
+        
+        # Backwards matching
+        if self.backwards_regex:
+            backwards_matches = self.backwards_regex.findall(clean_lower)
+            matches.extend([("backwards", match) for match in backwards_matches if match])
+        
+        return matches
+    
+    def _find_pattern_matches_batch(self, clean_names: List[str]) -> List[List[Tuple[str, str]]]:
+        """Run each evasion-pattern regex once over all names joined into one buffer."""
+        buffer = BATCH_SEPARATOR.join(clean_names)
+        starts = list(itertools.accumulate((len(name) + 1 for name in clean_names[:-1]), initial=0))
+        matches: List[List[Tuple[str, str]]] = [[] for _ in clean_names]
+        
+        pattern_groups = (
+            ("basic_match", self.basic_regex),
+            ("leet_speak", self.leet_regex),
+            ("spaced_evasion", self.spaced_regex),
+            ("repeat_chars", self.repeat_regex),
+            ("backwards", self.backwards_regex),
+        )
+        for match_type, regex in pattern_groups:
+            if not regex:
+                continue
+            for match in regex.finditer(buffer):
+                if match.group():
+                    # Map the match offset back to the name it came from
+                    name_index = bisect.bisect_right(starts, match.start()) - 1
+                    matches[name_index].append((match_type, match.group()))
+        
+        return matches
+    
     def _clean_username(self, username: str) -> str:
         """Clean username for analysis (remove decorators, normalize)."""
         # Remove common decorators
@@ -271,9 +437,8 @@ class UsernameFilter:
         cleaned = re.sub(r'\d+', '', cleaned)
         
         # Replace common character substitutions
-        if hasattr(self, 'replacements'):
-            for replacement, original in self.replacements.items():
-                cleaned = cleaned.replace(replacement, original)
+        for replacement, original in self.replacements.items():
+            cleaned = cleaned.replace(replacement, original)
         
         return cleaned.strip()
     
@@ -319,22 +484,29 @@ class UsernameFilter:
         if not matches:
             return 0.0
         
-        confidence = 0.0
-        for match_type, word in matches:
-            if "hate_speech" in match_type:
-                confidence += 0.9
-            elif "profanity" in match_type:
-                confidence += 0.7
-            elif "inappropriate" in match_type:
-                confidence += 0.5
-            elif "partial" in match_type:
-                confidence += 0.3
-            else:
-                confidence += 0.6
+        weights = self._match_weights
+        confidence = sum(
+            weights[match_type] if match_type in weights else self._match_weight(match_type)
+            for match_type, _ in matches
+        )
         
         # Cap at 1.0
         return min(confidence, 1.0)
     
+    @staticmethod
+    def _match_weight(match_type: str) -> float:
+        """Confidence contribution of a single match of the given type."""
+        if "hate_speech" in match_type:
+            return 0.9
+        elif "profanity" in match_type:
+            return 0.7
+        elif "inappropriate" in match_type:
+            return 0.5
+        elif "partial" in match_type:
+            return 0.3
+        else:
+            return 0.6
+    
     def get_stats(self) -> Dict:
         """Get filter statistics and configuration info."""
         total_words = sum(len(words) for words in self.config["word_lists"].values())
@@ -376,6 +548,8 @@ class UsernameFilter:
     
     def _save_config(self):
         """Save current configuration to file."""
+        # Cached results may depend on the settings being saved
+        self._check_username_cached.cache_clear()
         try:
             with open(self.config_path, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
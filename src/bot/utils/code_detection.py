@@ -5,10 +5,16 @@ Handles text-based and image-based code detection
 
 import re
 import io
+import asyncio
 import logging
-import requests
+import functools
+from typing import Optional
+
+import aiohttp
 from PIL import Image
 
+from bot.utils.multi_pattern import build_hyperscan_database, compile_pattern, scan_pattern_ids
+
 logger = logging.getLogger(__name__)
 
 # Try to import OCR functionality
@@ -20,6 +26,20 @@ except ImportError:
     logger.warning("pytesseract not available - image detection will be limited")
 
 
+@functools.lru_cache(maxsize=1)
+def get_ocr_version():
+    """Return the installed Tesseract version, or None if Tesseract cannot be run.
+    
+    Checking launches the tesseract binary, so the answer is cached for the process.
+    """
+    if not TESSERACT_AVAILABLE:
+        return None
+    try:
+        return pytesseract.get_tesseract_version()
+    except Exception as e:
+        logger.debug(f"Tesseract version check failed: {e}")
+        return None
+
 # Code detection patterns
 CODE_PATTERNS = [
     # Programming language keywords and patterns
@@ -27,15 +47,26 @@ CODE_PATTERNS = [
     r'[\{\}\[\]();].*[\{\}\[\]();]',  # Multiple brackets/parentheses
     r'#include\s*<.*>',  # C/C++ includes
     r'@\w+',  # Decorators/annotations
-    r'\b\w+\s*\(\s*\w*\s*\w+\s*\w*\s*\)',  # Function calls
+    r'\b\w+\s*\([^)]*\)',  # Function calls (one class up to the closing paren, so no backtracking)
     r'console\.log|print\(|System\.out|cout\s*<<',  # Output statements
     r'\/\/.*|\/\*.*\*\/|#.*',  # Comments (but be careful with URLs)
     r'\b(SELECT|INSERT|UPDATE|DELETE|CREATE|DROP|ALTER)\b',  # SQL keywords
     r'<\/?[a-z][\s\S]*>',  # HTML tags
 ]
 
-# Compile regex patterns for better performance
-compiled_patterns = [re.compile(pattern, re.IGNORECASE | re.MULTILINE) for pattern in CODE_PATTERNS]
+# Compile regex patterns for better performance (RE2 when installed)
+compiled_patterns = [compile_pattern(pattern, re.IGNORECASE | re.MULTILINE) for pattern in CODE_PATTERNS]
+
+# Optional Hyperscan database that checks every pattern in a single pass
+pattern_database = build_hyperscan_database(CODE_PATTERNS, multiline=True)
+
+# Image download limits
+MAX_IMAGE_BYTES = 10 * 1024 * 1024  # Abort downloads larger than 10 MiB
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+# Reject decompression bombs before any pixel data is decoded
+Image.MAX_IMAGE_PIXELS = 25_000_000
 
 
 class CodeDetector:
@@ -43,6 +74,7 @@ class CodeDetector:
     
     def __init__(self, tesseract_available=TESSERACT_AVAILABLE):
         self.tesseract_available = tesseract_available
+        self._session: Optional[aiohttp.ClientSession] = None  # Created lazily inside the event loop
         
     def detect_code_in_text(self, text):
         """Detect if text contains code using multiple analysis methods"""
@@ -148,12 +180,16 @@ class CodeDetector:
     
     def _analyze_syntax(self, text):
         """Analyze syntax patterns using compiled regex"""
-        matches = 0
         total_patterns = len(compiled_patterns)
         
-        for pattern in compiled_patterns:
-            if pattern.search(text):
-                matches += 1
+        matched_ids = scan_pattern_ids(pattern_database, text) if pattern_database else None
+        if matched_ids is not None:
+            matches = len(matched_ids)
+        else:
+            matches = 0
+            for pattern in compiled_patterns:
+                if pattern.search(text):
+                    matches += 1
         
         return matches / total_patterns if total_patterns > 0 else 0
     
@@ -179,24 +215,14 @@ class CodeDetector:
             return None  # Indicates OCR unavailable
         
         try:
-            # Download image
-            response = requests.get(image_url, timeout=10)
-            response.raise_for_status()
-            
-            # Basic size check
-            if len(response.content) > 10 * 1024 * 1024:
+            # Download image without blocking the event loop
+            image_data = await self._download_image(image_url)
+            if image_data is None:
                 logger.warning("Image too large for processing")
                 return False
-                
-            # Convert to PIL Image
-            image = Image.open(io.BytesIO(response.content))
             
-            # Resize if too large (for faster processing)
-            if image.width > 2000 or image.height > 2000:
-                image.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
-            
-            # Extract text using OCR
-            extracted_text = pytesseract.image_to_string(image, config='--psm 6')
+            # Decoding and OCR are CPU-bound, so run them in a worker thread
+            extracted_text = await asyncio.to_thread(self._extract_text, image_data)
             
             if not extracted_text.strip():
                 logger.debug("No text extracted from image")
@@ -207,9 +233,12 @@ class CodeDetector:
             # Check if extracted text contains code
             return self.detect_code_in_text(extracted_text)
             
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             logger.error(f"Network error downloading image: {e}")
             return False
+        except Image.DecompressionBombError as e:
+            logger.warning(f"Image rejected: {e}")
+            return False
         except Exception as e:
             if 'TesseractNotFoundError' in str(type(e)):
                 logger.error("Tesseract not found - image detection disabled")
@@ -217,6 +246,53 @@ class CodeDetector:
             logger.error(f"Error processing image: {e}")
             return None
     
+    async def _download_image(self, image_url):
+        """Stream an image into memory, returning None if it exceeds MAX_IMAGE_BYTES"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        
+        async with self._session.get(image_url, timeout=DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            
+            # Reject early when the server advertises an oversized body
+            if response.content_length and response.content_length > MAX_IMAGE_BYTES:
+                return None
+            
+            buffer = io.BytesIO()
+            async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                buffer.write(chunk)
+                if buffer.tell() > MAX_IMAGE_BYTES:
+                    return None
+        
+        buffer.seek(0)
+        return buffer
+    
+    def _extract_text(self, image_data):
+        """Decode an image and run OCR on it (blocking - call via asyncio.to_thread)"""
+        image = Image.open(image_data)
+        if image.width * image.height > Image.MAX_IMAGE_PIXELS:
+            raise Image.DecompressionBombError(
+                f"Image size ({image.width}x{image.height}) exceeds limit of {Image.MAX_IMAGE_PIXELS} pixels"
+            )
+        
+        # OCR doesn't need colour - let JPEG decode straight to reduced-size grayscale
+        image.draft('L', (1500, 1500))
+        if image.mode != 'L':
+            image = image.convert('L')
+        
+        # Resize if too large (for faster processing)
+        if image.width > 2000 or image.height > 2000:
+            image.thumbnail((2000, 2000), Image.Resampling.LANCZOS)
+        
+        # Extract text using OCR
+        return pytesseract.image_to_string(image, config='--psm 6')
+    
+    async def close(self):
+        """Close the HTTP session used for image downloads"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
     def is_ocr_available(self):
         """Check if OCR functionality is available"""
-        return self.tesseract_available
\ No newline at end of file
+        return self.tesseract_available and get_ocr_version() is not None
\ No newline at end of file
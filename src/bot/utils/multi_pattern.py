@@ -0,0 +1,100 @@
+"""
+Multi-pattern Matching Utilities
+Optional RE2 and Hyperscan backends for the bot's hot-path regular expressions
+"""
+
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Try to import RE2 (optional - guaranteed linear-time matching)
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Try to import Hyperscan (optional - callers fall back to Python regex)
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# re flags that RE2 understands as inline modifiers
+_RE2_INLINE_FLAGS = {
+    re.IGNORECASE: 'i',
+    re.MULTILINE: 'm',
+    re.DOTALL: 's',
+}
+
+
+def compile_pattern(pattern, flags=0):
+    """Compile a regex with RE2 when available, otherwise with Python's re.
+
+    RE2 matches in linear time, so adversarial input cannot trigger
+    catastrophic backtracking. Patterns RE2 does not support (lookarounds,
+    backreferences) or unsupported flags fall back to re. Note that RE2's
+    \\w, \\s and \\b are ASCII-only.
+    """
+    if RE2_AVAILABLE:
+        inline = ''.join(letter for flag, letter in _RE2_INLINE_FLAGS.items() if flags & flag)
+        remaining = flags & ~(re.IGNORECASE | re.MULTILINE | re.DOTALL)
+        if not remaining:
+            try:
+                return re2.compile(f'(?{inline}){pattern}' if inline else pattern)
+            except Exception as e:
+                logger.debug(f"RE2 cannot compile pattern, using re: {e}")
+    return re.compile(pattern, flags)
+
+
+def build_hyperscan_database(patterns, multiline=False):
+    """Compile regex patterns into a single case-insensitive Hyperscan database.
+
+    Pattern IDs are the indexes into ``patterns``. Returns None when Hyperscan
+    is not installed or cannot compile the patterns, so callers can keep
+    using their regular expressions.
+    """
+    if not HYPERSCAN_AVAILABLE or not patterns:
+        return None
+
+    # UTF8/UCP keep \w, \s and \b Unicode-aware like Python's re;
+    # SINGLEMATCH reports each pattern at most once per scan
+    flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8 |
+             hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH)
+    if multiline:
+        flags |= hyperscan.HS_FLAG_MULTILINE
+
+    try:
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=[pattern.encode('utf-8') for pattern in patterns],
+            ids=list(range(len(patterns))),
+            elements=len(patterns),
+            flags=[flags] * len(patterns)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan could not compile patterns, using regex fallback: {e}")
+        return None
+
+
+def scan_pattern_ids(database, text):
+    """Return the set of pattern IDs that match text.
+
+    Returns None if the text cannot be scanned (e.g. it is not valid UTF-8),
+    in which case callers should fall back to their regular expressions.
+    """
+    try:
+        data = text.encode('utf-8')
+    except UnicodeEncodeError:
+        return None
+
+    matched = set()
+
+    def on_match(pattern_id, start, end, flags, context):
+        matched.add(pattern_id)
+
+    database.scan(data, match_event_handler=on_match)
+    return matched
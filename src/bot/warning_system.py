@@ -3,135 +3,296 @@ Persistent Warning System for Discord Bot
 Handles user warnings with automatic expiration and JSON storage
 """
 
-import json
 import os
+import sys
+import json
+import asyncio
+import heapq
+import hashlib
+import atexit
+import time
 import logging
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import threading
+from collections import deque
+from pathlib import Path
+from datetime import datetime
+from typing import Deque, Dict, List, NamedTuple, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Large write buffer so the file is written in as few syscalls as possible
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Read paths only sweep for expired warnings this often (seconds)
+CLEANUP_INTERVAL = 60 * 60
+
+SECONDS_PER_DAY = 24 * 60 * 60
+
+# Try to import orjson (faster serialization, falls back to the json module)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class WarningRecord(NamedTuple):
+    """A single warning; a tuple is far smaller than a two-key dict"""
+    timestamp: int  # Unix seconds
+    reason: str
+
+
+def _dump_json(data) -> bytes:
+    """Serialize data to indented JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode('utf-8')
+
+
+def _load_json(raw: bytes):
+    """Parse JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class PersistentWarningSystem:
     """Persistent warning system with JSON storage and auto-expiration"""
     
-    def __init__(self, filename="data/warnings.json", expiry_days=30):
+    def __init__(self, filename="data/warnings.json", expiry_days=30, flush_interval=5.0):
         self.filename = filename
+        self._path = Path(filename)
+        self._temp_path = self._path.with_name(self._path.name + '.tmp')  # Same directory, so the replace is atomic
         self.expiry_days = expiry_days
-        self.warnings: Dict[int, List[Dict]] = {}
+        self._expiry_seconds = expiry_days * SECONDS_PER_DAY
+        self.flush_interval = flush_interval  # Seconds to batch changes before writing (0 = write immediately)
+        self.warnings: Dict[int, Deque[WarningRecord]] = {}  # Each user's warnings, oldest first
+        
+        # Min-heap of (oldest warning timestamp, user_id) so expiry only visits users with expired warnings
+        self._expiry_heap: List[Tuple[int, int]] = []
+        
+        # Per-user warning counts, valid until that user's warnings change
+        self._count_cache: Dict[int, int] = {}
+        self._total_active = 0  # Warnings across all users, kept in step with self.warnings
+        
+        # Serializable copy of self.warnings, refilled in place by each save
+        self._serialize_buf: Dict[str, List[Dict]] = {}
+        self._last_saved_hash: Optional[bytes] = None  # Digest of the last bytes written to disk
+        self._cleanup_watermark = 0.0  # Time of the last expiry sweep
+        
+        # Pending-write state; the timer thread and callers share the lock
+        self._dirty = False
+        self._flush_timer: Optional[threading.Timer] = None
+        self._lock = threading.RLock()
         
         # Ensure data directory exists
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
         
         self.load_warnings()
         
+        # Write any batched changes on shutdown; close() removes this hook
+        atexit.register(self.flush)
+        
     def load_warnings(self):
         """Load warnings from JSON file"""
         try:
-            if os.path.exists(self.filename):
-                with open(self.filename, 'r') as f:
-                    data = json.load(f)
+            if self._path.exists():
+                with self._path.open('rb') as f:
+                    data = _load_json(f.read())
                     # Convert string keys back to int and parse timestamps
                     self.warnings = {}
+                    self._count_cache.clear()
+                    self._cleanup_watermark = 0.0
+                    self._last_saved_hash = None
                     for user_id, warning_list in data.items():
-                        self.warnings[int(user_id)] = []
+                        user_warnings = []
                         for warning in warning_list:
                             if isinstance(warning, dict):
                                 # New format with timestamp
-                                self.warnings[int(user_id)].append({
-                                    'reason': warning['reason'],
-                                    'timestamp': datetime.fromisoformat(warning['timestamp'])
-                                })
+                                user_warnings.append(WarningRecord(
+                                    int(datetime.fromisoformat(warning['timestamp']).timestamp()),
+                                    sys.intern(warning['reason'])
+                                ))
                             else:
                                 # Old format - add current timestamp
-                                self.warnings[int(user_id)].append({
-                                    'reason': warning,
-                                    'timestamp': datetime.now()
-                                })
+                                user_warnings.append(WarningRecord(int(time.time()), sys.intern(warning)))
+                        if user_warnings:
+                            # Expiry pops from the left, so keep each user's warnings oldest first
+                            user_warnings.sort(key=lambda warning: warning.timestamp)
+                            self.warnings[int(user_id)] = deque(user_warnings)
+                    
+                    self._total_active = sum(len(user_warnings) for user_warnings in self.warnings.values())
+                    self._expiry_heap = [(user_warnings[0].timestamp, user_id)
+                                         for user_id, user_warnings in self.warnings.items()]
+                    heapq.heapify(self._expiry_heap)
                 logger.info(f"Loaded {len(self.warnings)} user warning records")
             else:
                 logger.info("No existing warnings file found - starting fresh")
         except Exception as e:
             logger.error(f"Error loading warnings: {e}")
             self.warnings = {}
+            self._expiry_heap = []
+            self._total_active = 0
     
     def save_warnings(self):
         """Save warnings to JSON file"""
-        try:
-            # Clean expired warnings before saving
-            self.cleanup_expired_warnings()
-            
-            # Convert to serializable format
-            data = {}
-            for user_id, warning_list in self.warnings.items():
-                data[str(user_id)] = []
-                for warning in warning_list:
-                    data[str(user_id)].append({
-                        'reason': warning['reason'],
-                        'timestamp': warning['timestamp'].isoformat()
-                    })
-            
-            with open(self.filename, 'w') as f:
-                json.dump(data, f, indent=2)
-            logger.debug(f"Saved warnings to {self.filename}")
-        except Exception as e:
-            logger.error(f"Error saving warnings: {e}")
+        with self._lock:
+            try:
+                # Clean expired warnings before saving
+                self.cleanup_expired_warnings()
+                
+                # Convert to serializable format (timestamps are stored as ISO 8601 on disk),
+                # reusing the buffer's dict and lists instead of rebuilding them every save
+                data = self._serialize_buf
+                for user_id, warning_list in self.warnings.items():
+                    records = data.setdefault(str(user_id), [])
+                    records.clear()
+                    for warning in warning_list:
+                        records.append({
+                            'reason': warning.reason,
+                            'timestamp': datetime.fromtimestamp(warning.timestamp).isoformat()
+                        })
+                # Drop users that were cleared or whose warnings all expired; only the
+                # stale keys are collected, rather than a copy of every user's key
+                stale_keys = [key for key in data if int(key) not in self.warnings]
+                for key in stale_keys:
+                    del data[key]
+                
+                # Skip the write entirely if the file already holds exactly this content
+                payload = _dump_json(data)
+                payload_hash = hashlib.blake2b(payload, digest_size=16).digest()
+                if payload_hash == self._last_saved_hash:
+                    self._dirty = False
+                    return
+                
+                # Write a temp file in the same directory, then swap it in with an atomic
+                # replace so a crash mid-write never leaves a truncated warnings file
+                try:
+                    with self._temp_path.open('wb', buffering=WRITE_BUFFER_SIZE) as f:
+                        f.write(payload)
+                    os.replace(self._temp_path, self._path)
+                except OSError:
+                    self._temp_path.unlink(missing_ok=True)
+                    raise
+                
+                self._last_saved_hash = payload_hash
+                self._dirty = False
+                logger.debug(f"Saved warnings to {self.filename}")
+            except Exception as e:
+                logger.error(f"Error saving warnings: {e}")
+    
+    async def save_warnings_async(self):
+        """Save warnings from a worker thread so the event loop is not blocked by file I/O"""
+        await asyncio.to_thread(self.save_warnings)
+    
+    def flush(self):
+        """Write pending changes to disk, if there are any"""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if self._dirty:
+                self.save_warnings()
+    
+    def close(self):
+        """Write pending changes, then drop the batching timer and the shutdown hook"""
+        self.flush()
+        atexit.unregister(self.flush)
+    
+    def _mark_dirty(self):
+        """Record an unsaved change and schedule a batched write"""
+        with self._lock:
+            self._dirty = True
+            if self.flush_interval <= 0:
+                self.save_warnings()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
     
     def cleanup_expired_warnings(self):
         """Remove warnings older than expiry_days"""
-        cutoff_date = datetime.now() - timedelta(days=self.expiry_days)
-        expired_count = 0
-        
-        for user_id in list(self.warnings.keys()):
-            original_count = len(self.warnings[user_id])
-            self.warnings[user_id] = [
-                warning for warning in self.warnings[user_id]
-                if warning['timestamp'] > cutoff_date
-            ]
-            expired_count += original_count - len(self.warnings[user_id])
+        with self._lock:
+            now = time.time()
+            self._cleanup_watermark = now
+            cutoff_date = int(now) - self._expiry_seconds
+            expired_count = 0
             
-            # Remove empty user records
-            if not self.warnings[user_id]:
-                del self.warnings[user_id]
-        
-        if expired_count > 0:
-            logger.info(f"Cleaned up {expired_count} expired warnings")
+            # Visit only users whose oldest warning has expired; when the heap's
+            # oldest entry is still fresh this stops after a single comparison
+            heap = self._expiry_heap
+            while heap and heap[0][0] <= cutoff_date:
+                oldest, user_id = heapq.heappop(heap)
+                user_warnings = self.warnings.get(user_id)
+                if not user_warnings or user_warnings[0].timestamp != oldest:
+                    continue  # Stale entry - the user's warnings were cleared since it was pushed
+                
+                while user_warnings and user_warnings[0].timestamp <= cutoff_date:
+                    user_warnings.popleft()
+                    expired_count += 1
+                    self._total_active -= 1
+                self._count_cache.pop(user_id, None)
+                
+                if user_warnings:
+                    heapq.heappush(heap, (user_warnings[0].timestamp, user_id))
+                else:
+                    # Remove empty user records
+                    del self.warnings[user_id]
+            
+            if expired_count > 0:
+                logger.info(f"Cleaned up {expired_count} expired warnings")
+    
+    def _maybe_cleanup(self):
+        """Remove expired warnings if the last sweep is older than CLEANUP_INTERVAL"""
+        if time.time() - self._cleanup_watermark > CLEANUP_INTERVAL:
+            self.cleanup_expired_warnings()
     
     def add_warning(self, user_id: int, reason: str) -> int:
         """Add a warning for a user"""
-        if user_id not in self.warnings:
-            self.warnings[user_id] = []
-        
-        warning = {
-            'reason': reason,
-            'timestamp': datetime.now()
-        }
-        self.warnings[user_id].append(warning)
-        self.save_warnings()
-        return len(self.warnings[user_id])
+        with self._lock:
+            # Reasons are mostly the same canned text, so share one string object between them
+            warning = WarningRecord(int(time.time()), sys.intern(reason))
+            
+            if user_id not in self.warnings:
+                self.warnings[user_id] = deque()
+                heapq.heappush(self._expiry_heap, (warning.timestamp, user_id))
+            self.warnings[user_id].append(warning)
+            self._total_active += 1
+            self._count_cache.pop(user_id, None)
+            self._mark_dirty()
+            return len(self.warnings[user_id])
     
     def get_warnings(self, user_id: int) -> List[Dict]:
         """Get all warnings for a user"""
-        self.cleanup_expired_warnings()
-        return self.warnings.get(user_id, [])
+        with self._lock:
+            self._maybe_cleanup()
+            return [{'reason': warning.reason, 'timestamp': datetime.fromtimestamp(warning.timestamp)}
+                    for warning in self.warnings.get(user_id, ())]
     
     def get_warning_count(self, user_id: int) -> int:
         """Get warning count for a user"""
-        return len(self.get_warnings(user_id))
+        with self._lock:
+            self._maybe_cleanup()
+            count = self._count_cache.get(user_id)
+            if count is None:
+                count = self._count_cache[user_id] = len(self.warnings.get(user_id, []))
+            return count
     
     def clear_warnings(self, user_id: int) -> bool:
         """Clear all warnings for a user"""
-        if user_id in self.warnings:
-            del self.warnings[user_id]
-            self.save_warnings()
-            return True
-        return False
+        with self._lock:
+            if user_id in self.warnings:
+                self._total_active -= len(self.warnings.pop(user_id))
+                self._count_cache.pop(user_id, None)
+                self._mark_dirty()
+                return True
+            return False
     
     def get_stats(self) -> Dict[str, int]:
         """Get warning system statistics"""
-        self.cleanup_expired_warnings()
-        total_users = len(self.warnings)
-        total_warnings = sum(len(warnings) for warnings in self.warnings.values())
+        with self._lock:
+            self._maybe_cleanup()
+            total_users = len(self.warnings)
+            total_warnings = self._total_active
         return {
             'total_users_with_warnings': total_users, 
             'total_active_warnings': total_warnings
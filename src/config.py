@@ -7,36 +7,53 @@ import os
 import sys
 import logging
 import platform
+import functools
+from dataclasses import dataclass, field
+from typing import ClassVar, Optional, Tuple
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Bot Configuration
+
+@functools.lru_cache(maxsize=None)
+def _env_int(name: str) -> Optional[int]:
+    """Read an integer environment variable once, or None if it is unset"""
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+def _env_role_names() -> Tuple[str, ...]:
+    """Parse the comma-separated ADMIN_ROLE_NAMES environment variable"""
+    return tuple(name.strip() for name in os.getenv('ADMIN_ROLE_NAMES', 'Professor,Teaching Assistant (TA)').split(','))
+
+
+# Bot Configuration - environment settings are read once, when CONFIG is created
+@dataclass(frozen=True, slots=True)
 class BotConfig:
     # Discord Settings
-    TOKEN = os.getenv('DISCORD_TOKEN')
-    GUILD_ID = int(os.getenv('GUILD_ID')) if os.getenv('GUILD_ID') else None
+    TOKEN: Optional[str] = field(default_factory=lambda: os.getenv('DISCORD_TOKEN'), repr=False)  # Keep the token out of logs
+    GUILD_ID: Optional[int] = field(default_factory=lambda: _env_int('GUILD_ID'))
     
     # Role Configuration
-    ALLOWED_ROLE_NAME = os.getenv('ALLOWED_ROLE_NAME', 'Student')
-    ADMIN_ROLE_NAMES = [name.strip() for name in os.getenv('ADMIN_ROLE_NAMES', 'Professor,Teaching Assistant (TA)').split(',')]
-    LOG_CHANNEL_ID = int(os.getenv('LOG_CHANNEL_ID')) if os.getenv('LOG_CHANNEL_ID') else None
+    ALLOWED_ROLE_NAME: str = field(default_factory=lambda: os.getenv('ALLOWED_ROLE_NAME', 'Student'))
+    ADMIN_ROLE_NAMES: Tuple[str, ...] = field(default_factory=_env_role_names)
+    LOG_CHANNEL_ID: Optional[int] = field(default_factory=lambda: _env_int('LOG_CHANNEL_ID'))
     
     # Bot Settings
-    COMMAND_PREFIX = '!'
-    DESCRIPTION = 'Class Bot - Monitors and manages code posting permissions'
+    COMMAND_PREFIX: ClassVar[str] = '!'
+    DESCRIPTION: ClassVar[str] = 'Class Bot - Monitors and manages code posting permissions'
     
     # Code Detection Settings
-    MIN_CODE_PATTERNS = 2  # Minimum pattern matches to consider as code
-    MIN_CODE_INDICATORS = 2  # Minimum structure indicators for code detection
-    MIN_TEXT_LENGTH = 10  # Minimum text length to analyze
+    MIN_CODE_PATTERNS: ClassVar[int] = 2  # Minimum pattern matches to consider as code
+    MIN_CODE_INDICATORS: ClassVar[int] = 2  # Minimum structure indicators for code detection
+    MIN_TEXT_LENGTH: ClassVar[int] = 10  # Minimum text length to analyze
     
     # Rate Limiting
-    REMOVAL_DELAY = 1  # Seconds between user removals to avoid rate limits
+    REMOVAL_DELAY: ClassVar[int] = 1  # Seconds between user removals to avoid rate limits
     
     # Tesseract Configuration (for Windows)
-    TESSERACT_PATH = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+    TESSERACT_PATH: ClassVar[str] = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
     
     @classmethod
     def setup_logging(cls):
@@ -57,58 +74,34 @@ class BotConfig:
         if hasattr(sys.stderr, 'reconfigure'):
             sys.stderr.reconfigure(encoding='utf-8', line_buffering=True)
     
-    @classmethod
-    def validate_config(cls):
+    def validate_config(self):
         """Validate that all required configuration is present"""
         errors = []
         
-        if not cls.TOKEN:
+        if not self.TOKEN:
             errors.append("DISCORD_TOKEN is required")
         
-        if not cls.GUILD_ID:
+        if not self.GUILD_ID:
             errors.append("GUILD_ID is required")
             
         return errors
     
-    @classmethod
-    def print_config(cls):
+    def print_config(self):
         """Print current configuration (excluding sensitive data)"""
         print("=== Class Bot Configuration ===")
-        print(f"Guild ID: {cls.GUILD_ID}")
-        print(f"Allowed Role: {cls.ALLOWED_ROLE_NAME}")
-        print(f"Admin Roles: {cls.ADMIN_ROLE_NAMES}")
-        print(f"Log Channel ID: {cls.LOG_CHANNEL_ID}")
-        print(f"Command Prefix: {cls.COMMAND_PREFIX}")
+        print(f"Guild ID: {self.GUILD_ID}")
+        print(f"Allowed Role: {self.ALLOWED_ROLE_NAME}")
+        print(f"Admin Roles: {list(self.ADMIN_ROLE_NAMES)}")
+        print(f"Log Channel ID: {self.LOG_CHANNEL_ID}")
+        print(f"Command Prefix: {self.COMMAND_PREFIX}")
         print("===============================")
 
-# Code Detection Patterns
-CODE_PATTERNS = [
-    # Programming language keywords
-    r'\b(def|class|import|from|if|else|elif|for|while|try|except|finally|return|yield|break|continue|pass|with|as|lambda|global|nonlocal)\b',
-    r'\b(function|var|let|const|int|string|bool|float|double|char|void|public|private|protected|static|final|abstract|interface|extends|implements)\b',
-    r'\b(SELECT|INSERT|UPDATE|DELETE|CREATE|DROP|ALTER|TABLE|FROM|WHERE|JOIN|GROUP|ORDER|BY|HAVING|UNION|INDEX)\b',
-    
-    # Syntax patterns
-    r'[\{\}\[\]();].*[\{\}\[\]();]',  # Multiple brackets/parentheses
-    r'#include\s*<.*>',  # C/C++ includes
-    r'@\w+',  # Decorators/annotations
-    r'\b\w+\s*\(\s*.*\s*\)',  # Function calls
-    
-    # Output statements
-    r'console\.log|print\(|System\.out|cout\s*<<|printf\(|println\(',
-    
-    # Comments (be careful not to match URLs)
-    r'^\s*\/\/.*$|^\s*\/\*.*\*\/\s*$|^\s*#(?!http).*$',
-    
-    # Variable assignments
-    r'^\s*[\w\s]*\s*[=]\s*[\w\s\(\)\[\]\'\"]*;?\s*$',
-    
-    # HTML/XML tags
-    r'<\/?[a-z][\s\S]*>',
-    
-    # Common file extensions in code
-    r'\.(py|js|java|cpp|c|h|html|css|php|rb|go|rs|swift|kt|scala|sh|sql|json|xml|yaml|yml)(\s|$)',
-]
+
+# The bot's configuration, loaded once at import
+CONFIG = BotConfig()
+
+# Code detection patterns live in bot.utils.code_detection.CODE_PATTERNS, next to
+# the detector that compiles and scans them
 
 # Warning Messages
 class Messages:
@@ -134,11 +127,11 @@ class Colors:
 
 if __name__ == "__main__":
     # Test configuration
-    errors = BotConfig.validate_config()
+    errors = CONFIG.validate_config()
     if errors:
         print("Configuration errors:")
         for error in errors:
             print(f"  - {error}")
     else:
         print("Configuration is valid!")
-        BotConfig.print_config()
\ No newline at end of file
+        CONFIG.print_config()
\ No newline at end of file
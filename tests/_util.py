@@ -0,0 +1,21 @@
+"""
+Shared helpers for the tests that report progress as they run
+"""
+import io
+import sys
+
+# Test output is buffered and written in one go rather than one write per line
+_output = io.StringIO()
+
+
+def log(*args, **kwargs):
+    """Buffer a line of test output"""
+    print(*args, file=_output, **kwargs)
+
+
+def flush_log():
+    """Write the buffered test output to stdout"""
+    sys.stdout.write(_output.getvalue())
+    sys.stdout.flush()
+    _output.seek(0)
+    _output.truncate()
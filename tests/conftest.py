@@ -0,0 +1,17 @@
+"""
+Shared pytest setup for the bot tests
+"""
+import os
+import sys
+
+import pytest
+
+# Add src directory to Python path once for every test module
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+
+@pytest.fixture(scope="session")
+def warning_sys_cls():
+    """The persistent warning system class, imported once per session"""
+    from bot.warning_system import PersistentWarningSystem
+    return PersistentWarningSystem
@@ -11,11 +11,16 @@ from src.bot.bot_controller import BotController
 import json
 from datetime import datetime, timedelta
 
+import pytest
+
+from _util import log, flush_log
+
+
 def test_bot_status():
     """Test the bot status functionality."""
-    print("=" * 60)
-    print("🤖 TESTING BOT STATUS WITH OCR INTEGRATION")
-    print("=" * 60)
+    log("=" * 60)
+    log("🤖 TESTING BOT STATUS WITH OCR INTEGRATION")
+    log("=" * 60)
     
     try:
         # Initialize bot controller
@@ -23,100 +28,93 @@ def test_bot_status():
         
         # Get full status
         status = controller.get_status()
+        assert isinstance(status["enabled"], bool)
         
-        print("\n📊 Complete Bot Status:")
-        print("-" * 30)
+        log("\n📊 Complete Bot Status:")
+        log("-" * 30)
         
         # Bot state
         if status["enabled"]:
-            print("🟢 Bot Status: ONLINE")
-            print("✅ All Commands: Available")
-            print("🔍 Monitoring: Active")
+            log("🟢 Bot Status: ONLINE")
+            log("✅ All Commands: Available")
+            log("🔍 Monitoring: Active")
         else:
-            print("🔴 Bot Status: DISABLED")
+            log("🔴 Bot Status: DISABLED")
             if status["maintenance_mode"]:
-                print("🔧 Mode: Maintenance")
+                log("🔧 Mode: Maintenance")
             else:
-                print("⏸️ Mode: Temporarily Disabled")
+                log("⏸️ Mode: Temporarily Disabled")
             
             if status["disabled_reason"]:
-                print(f"📝 Reason: {status['disabled_reason']}")
+                log(f"📝 Reason: {status['disabled_reason']}")
             
             if status["disabled_by"]:
-                print(f"👤 Disabled By: {status['disabled_by']}")
+                log(f"👤 Disabled By: {status['disabled_by']}")
             
             if status.get("remaining_minutes") and status["remaining_minutes"] > 0:
-                print(f"⏱️ Re-enabled In: {status['remaining_minutes']} minutes")
+                log(f"⏱️ Re-enabled In: {status['remaining_minutes']} minutes")
         
         # OCR Status
-        if "ocr" in status:
-            print(f"\n🖼️ OCR System Status:")
-            print("-" * 20)
-            ocr_data = status["ocr"]
-            print(f"Status: {ocr_data['status']}")
-            print(f"Available: {ocr_data['available']}")
-            print(f"Version: {ocr_data['version']}")
-            
-            # Format for Discord-like display
-            ocr_field_value = ocr_data["status"]
-            if ocr_data["available"] and ocr_data["version"] != "Unknown" and "version check failed" not in ocr_data["version"]:
-                ocr_field_value += f" (v{ocr_data['version']})"
-            elif not ocr_data["available"]:
-                ocr_field_value += "\nImage detection disabled"
-            
-            print(f"Discord Display: {ocr_field_value}")
+        assert "ocr" in status, "Bot status has no OCR section"
+        log(f"\n🖼️ OCR System Status:")
+        log("-" * 20)
+        ocr_data = status["ocr"]
+        log(f"Status: {ocr_data['status']}")
+        log(f"Available: {ocr_data['available']}")
+        log(f"Version: {ocr_data['version']}")
+        
+        # Format for Discord-like display
+        ocr_field_value = ocr_data["status"]
+        if ocr_data["available"] and ocr_data["version"] != "Unknown" and "version check failed" not in ocr_data["version"]:
+            ocr_field_value += f" (v{ocr_data['version']})"
+        elif not ocr_data["available"]:
+            ocr_field_value += "\nImage detection disabled"
+        
+        log(f"Discord Display: {ocr_field_value}")
         
         # System info
-        print(f"\n🔧 System Information:")
-        print("-" * 20)
-        print("Bot Version: ClassBot v2.0")
+        log(f"\n🔧 System Information:")
+        log("-" * 20)
+        log("Bot Version: ClassBot v2.0")
         current_time = datetime.now()
         uptime_start = current_time - timedelta(hours=1)  # Simulated uptime
-        print(f"Simulated Uptime: Started {uptime_start.strftime('%H:%M:%S')}")
-        
-        print("\n" + "=" * 60)
-        print("✅ BOT STATUS TEST COMPLETED SUCCESSFULLY")
-        print("=" * 60)
-        
-        return True
+        log(f"Simulated Uptime: Started {uptime_start.strftime('%H:%M:%S')}")
         
-    except Exception as e:
-        print(f"❌ Error during bot status test: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
+        log("\n" + "=" * 60)
+        log("✅ BOT STATUS TEST COMPLETED SUCCESSFULLY")
+        log("=" * 60)
+    finally:
+        flush_log()
 
 def test_ocr_standalone():
     """Test OCR functionality separately."""
-    print("\n🖼️ TESTING OCR SYSTEM SEPARATELY")
-    print("-" * 40)
+    # The OCR check imports the code detector, which needs aiohttp and PIL
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("PIL")
+    
+    log("\n🖼️ TESTING OCR SYSTEM SEPARATELY")
+    log("-" * 40)
     
     try:
         controller = BotController()
         ocr_status = controller.get_ocr_status()
         
-        print("OCR Test Results:")
+        log("OCR Test Results:")
         for key, value in ocr_status.items():
-            print(f"  {key}: {value}")
-        
-        return True
+            log(f"  {key}: {value}")
         
-    except Exception as e:
-        print(f"❌ OCR test failed: {e}")
-        return False
+        assert "error" not in ocr_status, f"OCR status check failed: {ocr_status.get('error')}"
+        assert {"available", "version", "status"} <= ocr_status.keys()
+    finally:
+        flush_log()
 
 if __name__ == "__main__":
-    print("🚀 Starting Bot Status Tests...\n")
-    
-    # Test individual components
-    ocr_success = test_ocr_standalone()
-    status_success = test_bot_status()
+    log("🚀 Starting Bot Status Tests...\n")
+    flush_log()
     
-    print(f"\n📋 Test Summary:")
-    print(f"OCR Test: {'✅ PASS' if ocr_success else '❌ FAIL'}")
-    print(f"Bot Status Test: {'✅ PASS' if status_success else '❌ FAIL'}")
+    # Test individual components; a failure stops here with its traceback
+    test_ocr_standalone()
+    test_bot_status()
     
-    if ocr_success and status_success:
-        print(f"\n🎉 ALL TESTS PASSED - Ready for Discord!")
-    else:
-        print(f"\n⚠️ Some tests failed - check the errors above")
\ No newline at end of file
+    log(f"\n🎉 ALL TESTS PASSED - Ready for Discord!")
+    flush_log()
\ No newline at end of file
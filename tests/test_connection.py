@@ -10,6 +10,9 @@ import os
 # Load environment variables
 load_dotenv()
 
+from _util import log, flush_log
+
+
 async def test_bot_connection():
     """Test if the bot can connect to Discord"""
     
@@ -17,15 +20,15 @@ async def test_bot_connection():
     GUILD_ID = int(os.getenv('GUILD_ID')) if os.getenv('GUILD_ID') else None
     
     if not TOKEN:
-        print("❌ DISCORD_TOKEN not found in .env file")
+        log("❌ DISCORD_TOKEN not found in .env file")
         return False
     
     if not GUILD_ID:
-        print("❌ GUILD_ID not found in .env file")
+        log("❌ GUILD_ID not found in .env file")
         return False
     
-    print("🔍 Testing Discord bot connection...")
-    print(f"Guild ID: {GUILD_ID}")
+    log("🔍 Testing Discord bot connection...")
+    log(f"Guild ID: {GUILD_ID}")
     
     # Configure intents
     intents = discord.Intents.default()
@@ -37,32 +40,32 @@ async def test_bot_connection():
     
     @client.event
     async def on_ready():
-        print(f"✅ Bot connected successfully!")
-        print(f"Bot name: {client.user.name}")
-        print(f"Bot ID: {client.user.id}")
+        log(f"✅ Bot connected successfully!")
+        log(f"Bot name: {client.user.name}")
+        log(f"Bot ID: {client.user.id}")
         
         # Try to find the guild
         guild = client.get_guild(GUILD_ID)
         if guild:
-            print(f"✅ Found server: {guild.name}")
-            print(f"Server member count: {guild.member_count}")
+            log(f"✅ Found server: {guild.name}")
+            log(f"Server member count: {guild.member_count}")
             
             # Check roles
             roles = [role.name for role in guild.roles if role.name != "@everyone"]
-            print(f"Server roles: {roles}")
+            log(f"Server roles: {roles}")
             
             # Check if bot has necessary permissions
             bot_member = guild.get_member(client.user.id)
             if bot_member:
                 permissions = bot_member.guild_permissions
-                print(f"Bot permissions:")
-                print(f"  - Can send messages: {permissions.send_messages}")
-                print(f"  - Can manage messages: {permissions.manage_messages}")
-                print(f"  - Can kick members: {permissions.kick_members}")
-                print(f"  - Can view channels: {permissions.view_channel}")
-                print(f"  - Can embed links: {permissions.embed_links}")
+                log(f"Bot permissions:")
+                log(f"  - Can send messages: {permissions.send_messages}")
+                log(f"  - Can manage messages: {permissions.manage_messages}")
+                log(f"  - Can kick members: {permissions.kick_members}")
+                log(f"  - Can view channels: {permissions.view_channel}")
+                log(f"  - Can embed links: {permissions.embed_links}")
         else:
-            print(f"❌ Could not find server with ID {GUILD_ID}")
+            log(f"❌ Could not find server with ID {GUILD_ID}")
         
         # Disconnect after test
         await client.close()
@@ -70,11 +73,16 @@ async def test_bot_connection():
     try:
         await client.start(TOKEN)
     except discord.LoginFailure:
-        print("❌ Invalid bot token")
+        log("❌ Invalid bot token")
         return False
     except Exception as e:
-        print(f"❌ Connection error: {e}")
+        log(f"❌ Connection error: {e}")
         return False
+    finally:
+        flush_log()
 
 if __name__ == "__main__":
-    asyncio.run(test_bot_connection())
\ No newline at end of file
+    try:
+        asyncio.run(test_bot_connection())
+    finally:
+        flush_log()
\ No newline at end of file
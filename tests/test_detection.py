@@ -4,102 +4,266 @@ Run this to see how the detection handles various text samples
 """
 
 import re
+from bisect import bisect_right
+from itertools import accumulate
+
+# numpy is optional - it only speeds up counting bracket runs in long messages and
+# weighing the scores of large batches
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+    BRACKET_BYTES = np.frombuffer(b"{}[]()", dtype=np.uint8)
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Shorter texts are counted with the regex, which beats numpy's per-call overhead
+NUMPY_MIN_LENGTH = 256
+
+# Smaller batches are weighed in Python, which beats building an array
+NUMPY_MIN_BATCH = 64
+
+# Weights of the keyword, structure, syntax and context scores in the total
+SCORE_WEIGHTS = (
+    0.3,    # Keywords are important but not definitive
+    0.4,    # Structure is very important for code
+    0.4,    # Syntax patterns are crucial
+    0.2,    # Context helps reduce false positives
+)
+
+# Slack for float rounding when checking whether a score can still reach the threshold
+SCORE_TOLERANCE = 1e-9
 
 class CodeDetectionTester:
+    # All patterns are compiled once, when the class is defined. Keyword and context
+    # patterns are case-insensitive, so the text never needs lowercasing
+    
+    # More specific keyword patterns that are less likely to appear in normal text, fused into
+    # one alternation. Each alternative is a lookahead so overlapping matches are all seen,
+    # and the group name records which pattern fired
+    _STRONG_KW = re.compile('|'.join(f'(?=(?P<{name}>{pattern}))' for name, pattern in (
+        ('definition', r'\bdef\s+\w+\s*\('),           # function definitions
+        ('class_definition', r'\bclass\s+\w+\s*[:\(]'),  # class definitions
+        ('import', r'\bimport\s+\w+'),                 # import statements
+        ('from_import', r'\bfrom\s+\w+\s+import'),      # from import statements
+        ('return', r'\breturn\s+[^;]+[;\n]?'),         # return statements
+        ('output', r'\b(console\.log|print|printf|cout|System\.out)\s*\('),  # output functions
+        ('declaration', r'\b(int|string|bool|float|double|char|void)\s+\w+'),  # type declarations
+        ('modifier', r'\b(public|private|protected|static)\s+'),              # access modifiers
+    )), re.IGNORECASE)
+    
+    _WEAK_KW = re.compile('|'.join((
+        r'\b(?:if|else|elif|for|while|try|except|catch)\b',  # Control flow (common in speech)
+        r'\b(?:function|var|let|const)\b',                   # Variable declarations
+    )), re.IGNORECASE)
+    
+    # Line patterns for structure analysis ([^\S\n] is whitespace within a line)
+    # Consistent indentation (multiple levels)
+    _INDENTED_LINE = re.compile(r'^(?: {4}|\t)[^\S\n]*\S', re.MULTILINE)
+    # Last non-whitespace character of every non-empty line
+    _LAST_CHARACTER = re.compile(r'(\S)[^\S\n]*$', re.MULTILINE)
+    # Code-like line endings
+    _CODE_ENDINGS = frozenset(';{}:,')
+    # Brackets at end of lines (function calls, array access)
+    _BRACKETS = frozenset('{}[]()')
+    
+    _FUNCTION_CALL = re.compile(r'\w+\s*\([^)]*\)\s*[;,\n]')
+    # Assignments start at a word boundary and end within 200 characters, so a long
+    # word or an unterminated line is scanned once instead of from every position
+    _ASSIGNMENT = re.compile(r'\b\w+\s*=\s*[^=][^;,\n]{0,200}[;,\n]')
+    _BRACKET_SEQUENCE = re.compile(r'[\{\}\[\]()]+')
+    
+    # Comments (but avoid URLs), as one alternation - a line can only start one kind
+    _COMMENTS = re.compile(r'^\s*(?:' + '|'.join((
+        r'//[^\n]+$',           # Single line comments
+        r'/\*.*\*/\s*$',        # Block comments
+        r'#(?!http)[^\n]+$',    # Python comments (avoid #hashtags and URLs)
+    )) + ')', re.MULTILINE)
+    
+    # Code blocks (multiple lines with brackets)
+    _CODE_BLOCK = re.compile(r'\{[^}]*\n[^}]*\}', re.DOTALL)
+    
+    # Phrases that suggest natural language rather than code
+    _NATURAL_LANGUAGE = re.compile('|'.join((
+        r'\b(?:i think|i believe|in my opinion|what if|how about|let me know)\b',
+        r'\b(?:please|thank you|thanks|could you|would you|can you)\b',
+        r'\b(?:the problem is|i need help|i\'m confused|i don\'t understand)\b',
+        r'\b(?:assignment|homework|project|exercise|question)\b',
+    )), re.IGNORECASE)
+    
+    # Code-specific phrases that increase confidence
+    _CODE_PHRASES = re.compile('|'.join((
+        r'\b(?:compile|debug|syntax error|runtime error|null pointer)\b',
+        r'\b(?:algorithm|data structure|method|function|variable|array)\b',
+        r'\b(?:loop|iteration|recursion|binary search|sorting)\b',
+    )), re.IGNORECASE)
+    
+    # Joins the texts of a batch. Every keyword and context pattern stops at a
+    # semicolon, so no match can run from one text into the next
+    _BATCH_SEPARATOR = ';'
+    
     def __init__(self):
         pass
     
     def detect_code_in_text(self, text):
-        """Detect if text contains code using multiple sophisticated heuristics"""
+        """Detect if text contains code using multiple sophisticated heuristics, printing the scores"""
         if not text or len(text.strip()) < 15:
             return False
+        return self._report(text, self._analyze(text))
+    
+    def _report(self, text, analysis):
+        """Print the scores from _analyze for text and return whether it is code"""
+        total_score, keyword_score, structure_score, syntax_score, context_score = analysis
+        is_code = total_score >= 0.6
         
-        text_lower = text.lower()
-        lines = text.split('\n')
-        
-        # Score different aspects of the text
-        keyword_score = self._analyze_keywords(text_lower)
-        structure_score = self._analyze_structure(lines)
-        syntax_score = self._analyze_syntax(text)
-        context_score = self._analyze_context(text_lower)
-        
-        # Calculate weighted total score
-        total_score = (
-            keyword_score * 0.3 +      # Keywords are important but not definitive
-            structure_score * 0.4 +    # Structure is very important for code
-            syntax_score * 0.4 +       # Syntax patterns are crucial
-            context_score * 0.2        # Context helps reduce false positives
-        )
+        if structure_score is not None:
+            total_label = f"{total_score:.2f}"
+        else:
+            total_label = "below 0.60 (remaining analyses skipped)"
         
         print(f"Text: '{text[:50]}...'")
-        print(f"Scores: keyword={keyword_score:.2f}, structure={structure_score:.2f}, syntax={syntax_score:.2f}, context={context_score:.2f}")
-        print(f"Total score: {total_score:.2f} - {'CODE DETECTED' if total_score >= 0.6 else 'Normal text'}")
+        print(f"Scores: keyword={keyword_score:.2f}, structure={self._format_score(structure_score)}, "
+              f"syntax={self._format_score(syntax_score)}, context={context_score:.2f}")
+        print(f"Total score: {total_label} - {'CODE DETECTED' if is_code else 'Normal text'}")
         print("-" * 60)
         
-        return total_score >= 0.6
+        return is_code
     
-    def _analyze_keywords(self, text_lower):
-        """Analyze programming keywords with context awareness"""
-        # More specific keyword patterns that are less likely to appear in normal text
-        strong_keywords = [
-            r'\bdef\s+\w+\s*\(',           # function definitions
-            r'\bclass\s+\w+\s*[:\(]',      # class definitions
-            r'\bimport\s+\w+',             # import statements
-            r'\bfrom\s+\w+\s+import',      # from import statements
-            r'\breturn\s+[^;]+[;\n]?',     # return statements
-            r'\b(console\.log|print|printf|cout|System\.out)\s*\(',  # output functions
-            r'\b(int|string|bool|float|double|char|void)\s+\w+',     # type declarations
-            r'\b(public|private|protected|static)\s+',               # access modifiers
-        ]
-        
-        weak_keywords = [
-            r'\b(if|else|elif|for|while|try|except|catch)\b',  # Control flow (common in speech)
-            r'\b(function|var|let|const)\b',                   # Variable declarations
-        ]
-        
-        strong_matches = 0
-        weak_matches = 0
-        
-        for pattern in strong_keywords:
-            if re.search(pattern, text_lower):
-                strong_matches += 1
-        
-        for pattern in weak_keywords:
-            matches = len(re.findall(pattern, text_lower))
-            weak_matches += matches
+    def detect_batch(self, texts):
+        """Detect code in many texts without printing, returning one verdict per text.
+        
+        The keyword and context patterns sweep the whole batch once, and each match is
+        credited to the text it starts in.
+        """
+        texts = list(texts)
+        if len(texts) <= 1:
+            return [self._score(text) >= 0.6 for text in texts]
+        
+        joined = self._BATCH_SEPARATOR.join(texts)
+        # Offset of each text in the joined string
+        starts = list(accumulate((len(text) + 1 for text in texts[:-1]), initial=0))
+        
+        strong_matches = [set() for _ in texts]
+        for match in self._STRONG_KW.finditer(joined):
+            strong_matches[bisect_right(starts, match.start()) - 1].add(match.lastgroup)
+        
+        weak_counts, natural_counts, code_counts = ([0] * len(texts) for _ in range(3))
+        for counts, pattern in ((weak_counts, self._WEAK_KW),
+                                (natural_counts, self._NATURAL_LANGUAGE),
+                                (code_counts, self._CODE_PHRASES)):
+            for match in pattern.finditer(joined):
+                counts[bisect_right(starts, match.start()) - 1] += 1
+        
+        # Texts that pass pruning are weighed together once all their scores are known
+        results = [False] * len(texts)
+        candidates, rows = [], []
+        for i, text in enumerate(texts):
+            if not text or len(text.strip()) < 15:
+                continue
+            keyword_score = self._keyword_score(len(strong_matches[i]), weak_counts[i])
+            context_score = self._context_score(natural_counts[i], code_counts[i])
+            total_score, *scores = self._combine(text, keyword_score, context_score, weigh=False)
+            if total_score is None:
+                candidates.append(i)
+                rows.append(scores)
+        
+        for i, total_score in zip(candidates, self._weigh(rows)):
+            results[i] = total_score >= 0.6
+        return results
+    
+    def _score(self, text):
+        """Score text without printing anything - text is code if the score is at least 0.6"""
+        if not text or len(text.strip()) < 15:
+            return 0.0
+        return self._analyze(text)[0]
+    
+    def _analyze(self, text):
+        """Return the total score and the keyword, structure, syntax and context scores.
+        
+        Analyses that cannot change the verdict are skipped and returned as None; the
+        total is then the best score the text could have had, which is below 0.6.
+        """
+        # Score the cheap signals first
+        return self._combine(text, self._analyze_keywords(text), self._analyze_context(text))
+    
+    def _combine(self, text, keyword_score, context_score, weigh=True):
+        """Finish _analyze given the keyword and context scores.
+        
+        With weigh=False the total of a fully analyzed text is left as None for the caller.
+        """
+        best_case = keyword_score * 0.3 + context_score * 0.2
+        
+        # Syntax adds at most 0.4, and so does structure - but only for multi-line text
+        is_multiline = '\n' in text
+        structure_bound = 0.4 if is_multiline else 0
+        
+        # Skip the remaining analyses once even their best case cannot reach the threshold
+        if best_case + 0.4 + structure_bound < 0.6 - SCORE_TOLERANCE:
+            return best_case + 0.4 + structure_bound, keyword_score, None, None, context_score
         
+        syntax_score = self._analyze_syntax(text, is_multiline)
+        best_case += syntax_score * 0.4
+        if best_case + structure_bound < 0.6 - SCORE_TOLERANCE:
+            return best_case + structure_bound, keyword_score, None, syntax_score, context_score
+        
+        # A single line has no structure to analyze
+        structure_score = self._analyze_structure(text) if is_multiline else 0
+        
+        scores = (keyword_score, structure_score, syntax_score, context_score)
+        total_score = self._weigh((scores,))[0] if weigh else None
+        return (total_score, *scores)
+    
+    @staticmethod
+    def _weigh(rows):
+        """Return the weighted total of each row of keyword, structure, syntax and context scores"""
+        if NUMPY_AVAILABLE and len(rows) >= NUMPY_MIN_BATCH:
+            features = np.asarray(rows, dtype=np.float64)
+            # Add the columns in the same order as the scalar sum, so totals are identical
+            totals = features[:, 0] * SCORE_WEIGHTS[0]
+            for column in range(1, len(SCORE_WEIGHTS)):
+                totals = totals + features[:, column] * SCORE_WEIGHTS[column]
+            return totals.tolist()
+        
+        totals = []
+        for row in rows:
+            total_score = 0
+            for score, weight in zip(row, SCORE_WEIGHTS):
+                total_score += score * weight
+            totals.append(total_score)
+        return totals
+    
+    @staticmethod
+    def _format_score(score):
+        """Format a sub-score for the report, which may have been skipped"""
+        return "skipped" if score is None else f"{score:.2f}"
+    
+    def _analyze_keywords(self, text):
+        """Analyze programming keywords with context awareness"""
+        # Count each strong pattern once, however often it matches
+        strong_matches = len({match.lastgroup for match in self._STRONG_KW.finditer(text)})
+        weak_matches = sum(1 for _ in self._WEAK_KW.finditer(text))
+        return self._keyword_score(strong_matches, weak_matches)
+    
+    @staticmethod
+    def _keyword_score(strong_matches, weak_matches):
+        """Score the number of distinct strong patterns and weak keywords found"""
         # Strong keywords are much more indicative
         keyword_score = (strong_matches * 0.4) + (min(weak_matches, 5) * 0.05)
         return min(keyword_score, 1.0)
     
-    def _analyze_structure(self, lines):
+    def _analyze_structure(self, text):
         """Analyze code-like structural patterns"""
-        if len(lines) < 2:
+        if '\n' not in text:
             return 0
         
         structure_indicators = 0
-        indented_lines = 0
-        lines_with_endings = 0
-        bracket_lines = 0
         
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                continue
-            
-            # Check for consistent indentation (multiple levels)
-            if line.startswith('    ') or line.startswith('\t'):
-                indented_lines += 1
-            
-            # Check for code-like line endings
-            if stripped.endswith((';', '{', '}', ':', ',')):
-                lines_with_endings += 1
-            
-            # Check for brackets at end of lines (function calls, array access)
-            if re.search(r'[\{\}\[\]()]\s*$', stripped):
-                bracket_lines += 1
-        
-        total_lines = len([l for l in lines if l.strip()])
+        # Two regex sweeps over the whole text; blank lines never match. Line endings
+        # are then classified with set lookups on each line's last character
+        indented_lines = sum(1 for _ in self._INDENTED_LINE.finditer(text))
+        last_characters = self._LAST_CHARACTER.findall(text)
+        lines_with_endings = sum(1 for char in last_characters if char in self._CODE_ENDINGS)
+        bracket_lines = sum(1 for char in last_characters if char in self._BRACKETS)
+        total_lines = len(last_characters)
         
         if total_lines == 0:
             return 0
@@ -123,73 +287,58 @@ class CodeDetectionTester:
         
         return min(structure_indicators, 1.0)
     
-    def _analyze_syntax(self, text):
+    def _analyze_syntax(self, text, is_multiline=True):
         """Analyze syntax patterns specific to code"""
         syntax_score = 0
         
         # Function call patterns (more specific)
-        function_calls = len(re.findall(r'\w+\s*\([^)]*\)\s*[;,\n]', text))
+        function_calls = sum(1 for _ in self._FUNCTION_CALL.finditer(text))
         if function_calls >= 2:
             syntax_score += 0.4
         elif function_calls == 1:
             syntax_score += 0.2
         
         # Variable assignment patterns
-        assignments = len(re.findall(r'\w+\s*[=]\s*[^=][^;,\n]*[;,\n]', text))
+        assignments = sum(1 for _ in self._ASSIGNMENT.finditer(text))
         if assignments >= 2:
             syntax_score += 0.3
         
         # Multiple brackets/parentheses in sequence
-        bracket_sequences = len(re.findall(r'[\{\}\[\]()]+', text))
+        bracket_sequences = self._count_bracket_runs(text)
         if bracket_sequences >= 4:
             syntax_score += 0.3
         
-        # Comments (but avoid URLs)
-        comment_patterns = [
-            r'^\s*//[^\n]+$',           # Single line comments
-            r'^\s*/\*.*\*/\s*$',        # Block comments
-            r'^\s*#(?!http)[^\n]+$',    # Python comments (avoid #hashtags and URLs)
-        ]
-        
-        comments = 0
-        for pattern in comment_patterns:
-            comments += len(re.findall(pattern, text, re.MULTILINE))
+        comments = sum(1 for _ in self._COMMENTS.finditer(text))
         
         if comments >= 1:
             syntax_score += 0.2
         
-        # Code blocks (multiple lines with brackets)
-        if re.search(r'\{[^}]*\n[^}]*\}', text, re.DOTALL):
+        # Code blocks (multiple lines with brackets) - a single line can never match
+        if is_multiline and self._CODE_BLOCK.search(text):
             syntax_score += 0.4
         
         return min(syntax_score, 1.0)
     
-    def _analyze_context(self, text_lower):
+    def _count_bracket_runs(self, text):
+        """Count runs of consecutive bracket characters"""
+        if not NUMPY_AVAILABLE or len(text) < NUMPY_MIN_LENGTH:
+            return sum(1 for _ in self._BRACKET_SEQUENCE.finditer(text))
+        
+        # Brackets are ASCII, so they never appear inside a multi-byte UTF-8 sequence
+        data = np.frombuffer(text.encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+        is_bracket = np.isin(data, BRACKET_BYTES)
+        # A run starts at a bracket that is first in the text or follows a non-bracket
+        return int(is_bracket[0]) + int(np.count_nonzero(is_bracket[1:] & ~is_bracket[:-1]))
+    
+    def _analyze_context(self, text):
         """Analyze context to reduce false positives"""
-        # Phrases that suggest natural language rather than code
-        natural_language_phrases = [
-            r'\b(i think|i believe|in my opinion|what if|how about|let me know)\b',
-            r'\b(please|thank you|thanks|could you|would you|can you)\b',
-            r'\b(the problem is|i need help|i\'m confused|i don\'t understand)\b',
-            r'\b(assignment|homework|project|exercise|question)\b',
-        ]
-        
-        # Code-specific phrases that increase confidence
-        code_phrases = [
-            r'\b(compile|debug|syntax error|runtime error|null pointer)\b',
-            r'\b(algorithm|data structure|method|function|variable|array)\b',
-            r'\b(loop|iteration|recursion|binary search|sorting)\b',
-        ]
-        
-        natural_count = 0
-        code_count = 0
-        
-        for pattern in natural_language_phrases:
-            natural_count += len(re.findall(pattern, text_lower))
-        
-        for pattern in code_phrases:
-            code_count += len(re.findall(pattern, text_lower))
-        
+        natural_count = sum(1 for _ in self._NATURAL_LANGUAGE.finditer(text))
+        code_count = sum(1 for _ in self._CODE_PHRASES.finditer(text))
+        return self._context_score(natural_count, code_count)
+    
+    @staticmethod
+    def _context_score(natural_count, code_count):
+        """Score the number of natural language and code phrases found"""
         # If lots of natural language indicators, reduce score
         if natural_count >= 3:
             return -0.3
@@ -204,62 +353,84 @@ class CodeDetectionTester:
         
         return 0
 
-def test_code_detection():
-    """Test the improved code detection with various examples"""
-    detector = CodeDetectionTester()
+# Test cases, built once at import
+TEST_CASES = (
+    # Should NOT be flagged (natural language)
+    "If you want to pass the assignment, else you might fail the class. Please help me understand this problem.",
     
-    # Test cases
-    test_cases = [
-        # Should NOT be flagged (natural language)
-        "If you want to pass the assignment, else you might fail the class. Please help me understand this problem.",
-        
-        "What if we try a different approach? I think we should consider all the options before making a decision.",
-        
-        "The professor said if we don't submit on time, then we get a penalty. I need help with my homework assignment.",
-        
-        # Should be flagged (actual code)
-        """def calculate_grade(score):
+    "What if we try a different approach? I think we should consider all the options before making a decision.",
+    
+    "The professor said if we don't submit on time, then we get a penalty. I need help with my homework assignment.",
+    
+    # Should be flagged (actual code)
+    """def calculate_grade(score):
     if score >= 90:
         return 'A'
     else:
         return 'B'""",
-        
-        """for (int i = 0; i < n; i++) {
+    
+    """for (int i = 0; i < n; i++) {
     console.log(arr[i]);
     sum += arr[i];
 }""",
-        
-        "print('Hello World'); x = 5; y = x * 2;",
-        
-        """import numpy as np
+    
+    "print('Hello World'); x = 5; y = x * 2;",
+    
+    """import numpy as np
 from sklearn import datasets
 data = datasets.load_iris()""",
-        
-        # Edge cases
-        "I'm trying to understand if-else statements in Python programming. Can someone explain the syntax?",
-        
-        "The function should return true if the condition is met, else it returns false.",
-        
-        # More code examples that should be detected
-        """x = 5;
+    
+    # Edge cases
+    "I'm trying to understand if-else statements in Python programming. Can someone explain the syntax?",
+    
+    "The function should return true if the condition is met, else it returns false.",
+    
+    # More code examples that should be detected
+    """x = 5;
 y = 10;
 z = x + y;""",
-        
-        """public class HelloWorld {
+    
+    """public class HelloWorld {
     public static void main(String[] args) {
         System.out.println("Hello");
     }
 }""",
-        
-        "let x = 5; const y = 10; console.log(x + y);",
-    ]
+    
+    "let x = 5; const y = 10; console.log(x + y);",
+)
+
+# Whether each test case is code, in TEST_CASES order
+EXPECTED_CODE = (
+    False, False, False,            # Natural language
+    True, True, True, True,         # Code
+    False, False,                   # Edge cases talking about code
+    True, True, True,               # More code
+)
+
+# Test numbers (1-based) of code the heuristics currently score below the threshold
+KNOWN_MISSES = frozenset({6, 7, 10, 12})
+
+def test_code_detection():
+    """Test the improved code detection with various examples"""
+    detector = CodeDetectionTester()
     
     print("🧪 Testing Improved Code Detection")
     print("=" * 60)
     
-    for i, test in enumerate(test_cases, 1):
+    mismatches = []
+    for i, (test, expected) in enumerate(zip(TEST_CASES, EXPECTED_CODE), 1):
         print(f"\nTest {i}:")
-        detector.detect_code_in_text(test)
+        if detector.detect_code_in_text(test) != expected and i not in KNOWN_MISSES:
+            mismatches.append(f"Test {i}: expected {'code' if expected else 'normal text'} - '{test[:50]}...'")
+    
+    assert len(EXPECTED_CODE) == len(TEST_CASES)
+    assert not mismatches, "\n".join(mismatches)
+
+def test_batch_detection():
+    """Batch detection should agree with detecting each text on its own"""
+    detector = CodeDetectionTester()
+    texts = TEST_CASES + ("", "x return ", "short text")
+    assert detector.detect_batch(texts) == [detector._score(text) >= 0.6 for text in texts]
 
 if __name__ == "__main__":
     test_code_detection()
\ No newline at end of file
@@ -5,6 +5,7 @@ Test script to verify the help command change.
 
 import sys
 import os
+import json
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 def test_help_command_change():
@@ -13,72 +14,47 @@ def test_help_command_change():
     print("🔧 TESTING HELP COMMAND CHANGE")
     print("=" * 50)
     
-    # Test 1: Check main.py for the command definition
+    # Test 1: Check the command definition and that discord.py's default is off
     print("\n1. Checking command definition...")
     with open('main.py', 'r', encoding='utf-8') as f:
         main_content = f.read()
+    with open('src/bot/commands.py', 'r', encoding='utf-8') as f:
+        commands_content = f.read()
     
-    if "@bot.command(name='help')" in main_content:
-        print("✅ Command definition updated to 'help'")
-    else:
-        print("❌ Command definition not found")
-        return False
+    assert "name='help'" in commands_content, "Command definition not found"
+    print("✅ Command definition updated to 'help'")
     
-    if "help_command=None" in main_content:
-        print("✅ Default help command disabled")
-    else:
-        print("❌ Default help command not disabled")
-        return False
+    assert "help_command=None" in main_content, "Default help command not disabled"
+    print("✅ Default help command disabled")
     
     # Test 2: Check bot controller configuration
     print("\n2. Checking bot controller...")
-    try:
-        from src.bot.bot_controller import BotController
-        controller = BotController()
-        allowed_commands = controller.config.get('allowed_commands_when_disabled', [])
-        
-        if 'help' in allowed_commands and 'help_classbot' not in allowed_commands:
-            print("✅ Bot controller config updated")
-        else:
-            print("❌ Bot controller config not properly updated")
-            print(f"    Allowed commands: {allowed_commands}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error testing bot controller: {e}")
-        return False
+    from src.bot.bot_controller import BotController
+    controller = BotController()
+    allowed_commands = controller.config.get('allowed_commands_when_disabled', [])
+    
+    assert 'help' in allowed_commands and 'help_classbot' not in allowed_commands, \
+        f"Bot controller config not properly updated - allowed commands: {allowed_commands}"
+    print("✅ Bot controller config updated")
     
     # Test 3: Check JSON config file
     print("\n3. Checking JSON configuration...")
-    try:
-        import json
-        with open('config/bot_control.json', 'r', encoding='utf-8') as f:
-            config = json.load(f)
-        
-        allowed_commands = config.get('allowed_commands_when_disabled', [])
-        if 'help' in allowed_commands and 'help_classbot' not in allowed_commands:
-            print("✅ JSON config file updated")
-        else:
-            print("❌ JSON config file not properly updated")
-            print(f"    Allowed commands: {allowed_commands}")
-            return False
-            
-    except Exception as e:
-        print(f"❌ Error checking JSON config: {e}")
-        return False
+    with open('config/bot_control.json', 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    allowed_commands = config.get('allowed_commands_when_disabled', [])
+    assert 'help' in allowed_commands and 'help_classbot' not in allowed_commands, \
+        f"JSON config file not properly updated - allowed commands: {allowed_commands}"
+    print("✅ JSON config file updated")
     
     # Test 4: Check for remaining references to help_classbot
     print("\n4. Checking for old references...")
-    help_classbot_count = main_content.count('help_classbot')
-    help_count = main_content.count('`!help`')
+    help_classbot_count = main_content.count('help_classbot') + commands_content.count('help_classbot')
     
     print(f"   Remaining 'help_classbot' references: {help_classbot_count}")
-    print(f"   New '!help' command references: {help_count}")
     
-    if help_classbot_count == 0 and help_count >= 2:  # Should be at least 2 references to !help
-        print("✅ References properly updated")
-    else:
-        print("⚠️ Some references may need manual review")
+    assert help_classbot_count == 0, "Old 'help_classbot' references remain"
+    print("✅ References properly updated")
     
     print("\n" + "=" * 50)
     print("✅ HELP COMMAND CHANGE SUCCESSFUL!")
@@ -94,13 +70,7 @@ def test_help_command_change():
     print("\n🎯 Usage:")
     print("• Old command: !help_classbot")
     print("• New command: !help")
-    
-    return True
 
 if __name__ == "__main__":
-    success = test_help_command_change()
-    if not success:
-        print("\n❌ Some tests failed - please review the errors above")
-        sys.exit(1)
-    else:
-        print("\n🚀 Ready to use the new !help command!")
\ No newline at end of file
+    test_help_command_change()
+    print("\n🚀 Ready to use the new !help command!")
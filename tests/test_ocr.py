@@ -1,88 +1,93 @@
 """
 Test script to check if Tesseract OCR is installed and working
 """
+import shutil
+import importlib
 import subprocess
 import sys
 
+import pytest
+
+def _load_pytesseract():
+    """Import pytesseract (and with it PIL) only when it is needed, or return None if it isn't installed"""
+    try:
+        return importlib.import_module('pytesseract')
+    except ImportError:
+        return None
+
 def test_tesseract_installation():
     """Test if Tesseract is installed and accessible"""
     print("🔍 Testing Tesseract OCR Installation...")
     print("=" * 50)
     
-    try:
-        # Try to run tesseract --version
-        result = subprocess.run(['tesseract', '--version'], 
-                              capture_output=True, text=True, timeout=10)
-        
-        if result.returncode == 0:
-            print("✅ Tesseract is installed and accessible!")
-            print(f"Version info:\n{result.stdout}")
-            return True
-        else:
-            print("❌ Tesseract command failed")
-            print(f"Error: {result.stderr}")
-            return False
-            
-    except FileNotFoundError:
+    if not shutil.which('tesseract'):
         print("❌ Tesseract not found in PATH")
         print("\n📝 To install Tesseract on Windows:")
         print("1. Download from: https://github.com/UB-Mannheim/tesseract/wiki")
         print("2. Install the executable")
         print("3. Add to PATH or specify path in bot code")
-        return False
-    except subprocess.TimeoutExpired:
-        print("❌ Tesseract command timed out")
-        return False
-    except Exception as e:
-        print(f"❌ Error testing Tesseract: {e}")
-        return False
+        pytest.skip("Tesseract is not installed")
+    
+    # Ask pytesseract first; only if it can't answer, run the binary ourselves
+    pytesseract = _load_pytesseract()
+    if pytesseract is not None:
+        try:
+            version = pytesseract.get_tesseract_version()
+            print("✅ Tesseract is installed and accessible!")
+            print(f"Version info:\n{version}")
+            return
+        except EnvironmentError:
+            pass
+    
+    # Try to run tesseract --version
+    result = subprocess.run(['tesseract', '--version'], 
+                          capture_output=True, text=True, timeout=10)
+    
+    assert result.returncode == 0, f"Tesseract command failed: {result.stderr}"
+    print("✅ Tesseract is installed and accessible!")
+    print(f"Version info:\n{result.stdout}")
 
 def test_python_tesseract():
     """Test if pytesseract Python package works"""
     print("\n🐍 Testing Python Tesseract Package...")
     print("=" * 50)
     
+    pytesseract = pytest.importorskip("pytesseract")
+    from PIL import Image, ImageDraw
+    if not shutil.which('tesseract'):
+        pytest.skip("Tesseract is not installed")
+    
+    # Create a simple white image with black text
+    img = Image.new('RGB', (200, 50), color='white')
+    draw = ImageDraw.Draw(img)
+    draw.text((10, 10), "Hello World", fill='black')
+    
+    # Test OCR
+    text = pytesseract.image_to_string(img)
+    assert isinstance(text, str)
+    print(f"✅ pytesseract is working!")
+    print(f"Extracted text: '{text.strip()}'")
+
+def _passes(test):
+    """Run one of the tests above for the summary, reporting why it did not pass"""
     try:
-        import pytesseract
-        from PIL import Image
-        import io
-        import numpy as np
-        
-        # Create a simple test image with text
-        from PIL import Image, ImageDraw, ImageFont
-        
-        # Create a simple white image with black text
-        img = Image.new('RGB', (200, 50), color='white')
-        draw = ImageDraw.Draw(img)
-        
-        try:
-            # Try to use a default font
-            draw.text((10, 10), "Hello World", fill='black')
-        except:
-            # If font fails, still create the image
-            draw.text((10, 10), "Hello World", fill='black')
-        
-        # Test OCR
-        text = pytesseract.image_to_string(img)
-        print(f"✅ pytesseract is working!")
-        print(f"Extracted text: '{text.strip()}'")
-        
+        test()
         return True
-        
-    except ImportError as e:
-        print(f"❌ pytesseract not installed: {e}")
-        print("Install with: pip install pytesseract")
-        return False
-    except Exception as e:
-        print(f"❌ Error with pytesseract: {e}")
+    except (Exception, pytest.skip.Exception) as e:
+        print(f"❌ {e}")
         return False
 
 def main():
     print("🤖 Discord Bot - Tesseract OCR Test")
     print("=" * 50)
     
-    tesseract_ok = test_tesseract_installation()
-    python_ok = test_python_tesseract()
+    tesseract_ok = _passes(test_tesseract_installation)
+    if tesseract_ok:
+        python_ok = _passes(test_python_tesseract)
+    else:
+        # pytesseract cannot work without the binary, so don't import PIL and pytesseract at all
+        print("\n⏭️  Skipping Python Tesseract package test - Tesseract binary not available")
+        python_ok = False
     
     print("\n📊 Summary:")
     print("=" * 50)
@@ -3,162 +3,134 @@
 Test the new organized structure and verify all components work together
 """
 
-import os
-import sys
-import tempfile
-from datetime import datetime
+import re
+import shutil
 
-# Add src to path for imports
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
 
 def test_imports():
     """Test that all modules can be imported correctly"""
-    print("🔍 Testing Module Imports...")
-    try:
-        from bot.warning_system import PersistentWarningSystem
-        print("  ✅ Warning system import: OK")
-        
-        from bot.error_recovery import ErrorRecoverySystem, run_bot_with_recovery
-        print("  ✅ Error recovery import: OK")
-        
-        from bot.utils.code_detection import CodeDetector
-        print("  ✅ Code detection import: OK")
-        
-        return True
-    except ImportError as e:
-        print(f"  ❌ Import error: {e}")
-        return False
+    from bot.warning_system import PersistentWarningSystem
+    
+    pytest.importorskip("discord")
+    from bot.error_recovery import ErrorRecoverySystem
+    
+    pytest.importorskip("aiohttp")
+    from bot.utils.code_detection import CodeDetector
 
-def test_warning_system():
-    """Test persistent warning system functionality"""
-    print("\n🔍 Testing Persistent Warning System...")
-    try:
-        # Use a temporary file for testing
-        with tempfile.NamedTemporaryFile(mode='w+', suffix='.json', delete=False) as f:
-            temp_file = f.name
-        
-        from bot.warning_system import PersistentWarningSystem
-        warning_sys = PersistentWarningSystem(filename=temp_file, expiry_days=30)
-        
-        # Test adding warnings
-        count1 = warning_sys.add_warning(12345, "Test warning 1")
-        count2 = warning_sys.add_warning(12345, "Test warning 2") 
-        count3 = warning_sys.add_warning(67890, "Another user warning")
-        
-        print(f"  ✅ Added warnings - User 1: {count2} warnings, User 2: {count3} warning")
-        
-        # Test getting warnings
-        warnings = warning_sys.get_warnings(12345)
-        print(f"  ✅ Retrieved {len(warnings)} warnings for user 12345")
-        
-        # Test stats
-        stats = warning_sys.get_stats()
-        print(f"  ✅ Stats: {stats['total_users_with_warnings']} users, {stats['total_active_warnings']} warnings")
-        
-        # Test clearing
-        cleared = warning_sys.clear_warnings(12345)
-        print(f"  ✅ Cleared warnings for user: {cleared}")
-        
-        # Cleanup
-        os.unlink(temp_file)
-        
-        return True
-    except Exception as e:
-        print(f"  ❌ Warning system error: {e}")
-        return False
+@pytest.fixture
+def warning_sys(warning_sys_cls, tmp_path):
+    """A fresh warning system, backed by a temporary file, for each test"""
+    warning_sys = warning_sys_cls(filename=str(tmp_path / "warnings.json"), expiry_days=30)
+    yield warning_sys
+    # Write out batched saves while the directory still exists
+    warning_sys.close()
 
-def test_code_detection():
-    """Test code detection functionality"""
-    print("\n🔍 Testing Code Detection...")
-    try:
-        from bot.utils.code_detection import CodeDetector
-        detector = CodeDetector()
-        
-        # Test various code samples
-        test_cases = [
-            ("Normal text", "Hello everyone, how are you today?", False),
-            ("Python code", "def hello():\n    print('world')\n    return True", True),
-            ("JavaScript", "function test() {\n    console.log('test');\n    return false;\n}", True),
-            ("Conversation with 'if'", "If you have any questions, let me know", False)
-        ]
-        
-        for name, text, expected in test_cases:
-            result = detector.detect_code_in_text(text)
-            status = "✅" if result == expected else "❌"
-            print(f"  {status} {name}: {'Detected' if result else 'Not detected'} (expected: {'Detected' if expected else 'Not detected'})")
-        
-        # Test OCR availability
-        ocr_available = detector.is_ocr_available()
-        print(f"  ℹ️ OCR available: {ocr_available}")
-        
-        return True
-    except Exception as e:
-        print(f"  ❌ Code detection error: {e}")
-        return False
+def add_sample_warnings(warning_sys):
+    """Give user 12345 two warnings and user 67890 one"""
+    warning_sys.add_warning(12345, "Test warning 1")
+    warning_sys.add_warning(12345, "Test warning 2")
+    warning_sys.add_warning(67890, "Another user warning")
 
-def test_error_recovery():
-    """Test error recovery system (basic functionality)"""
-    print("\n🔍 Testing Error Recovery System...")
-    try:
-        # Set up fake environment
-        os.environ['DISCORD_TOKEN'] = 'fake_token'
-        
-        from bot.error_recovery import ErrorRecoverySystem
-        from bot.warning_system import PersistentWarningSystem
-        
-        # Create mock bot object
-        class MockBot:
-            pass
-        
-        mock_bot = MockBot()
-        warning_sys = PersistentWarningSystem()
-        error_recovery = ErrorRecoverySystem(mock_bot, warning_sys)
-        
-        # Test basic functionality
-        print("  ✅ Error recovery system initialized")
-        print(f"  ✅ Max reconnect attempts: {error_recovery.max_reconnect_attempts}")
-        print(f"  ✅ Reconnect delay: {error_recovery.reconnect_delay} seconds")
-        
-        # Test reset function
-        error_recovery.reset_reconnect_counter()
-        print("  ✅ Reconnect counter reset successfully")
-        
-        return True
-    except Exception as e:
-        print(f"  ❌ Error recovery error: {e}")
-        return False
+def test_add_warning(warning_sys):
+    """Adding warnings returns each user's running count"""
+    assert warning_sys.add_warning(12345, "Test warning 1") == 1
+    count2 = warning_sys.add_warning(12345, "Test warning 2")
+    count3 = warning_sys.add_warning(67890, "Another user warning")
+    assert (count2, count3) == (2, 1), f"User 1: {count2} warnings, User 2: {count3} warnings"
+
+def test_get_warnings(warning_sys):
+    """A user's warnings come back in the order they were added"""
+    add_sample_warnings(warning_sys)
+    warnings = warning_sys.get_warnings(12345)
+    assert [warning['reason'] for warning in warnings] == ["Test warning 1", "Test warning 2"]
 
-def main():
-    """Run all tests"""
-    print("🧪 Testing New Organized Bot Structure")
-    print("=" * 50)
+def test_warning_stats(warning_sys):
+    """Stats count users and warnings across the system"""
+    add_sample_warnings(warning_sys)
+    stats = warning_sys.get_stats()
+    assert (stats['total_users_with_warnings'], stats['total_active_warnings']) == (2, 3), \
+        f"Stats: {stats['total_users_with_warnings']} users, {stats['total_active_warnings']} warnings"
+
+def test_clear_warnings(warning_sys):
+    """Clearing removes only that user's warnings"""
+    add_sample_warnings(warning_sys)
+    assert warning_sys.clear_warnings(12345)
+    assert warning_sys.get_warnings(12345) == []
+    assert warning_sys.get_stats()['total_active_warnings'] == 1
+
+def test_close_writes_pending_changes(warning_sys_cls, tmp_path):
+    """close() saves batched changes right away and stops the flush timer"""
+    path = tmp_path / "warnings.json"
+    warning_sys = warning_sys_cls(filename=str(path), flush_interval=60)
+    warning_sys.add_warning(12345, "Batched warning")
+    warning_sys.close()
+    assert path.exists()
+    assert warning_sys._flush_timer is None
+
+def test_code_detection():
+    """Test code detection functionality"""
+    pytest.importorskip("aiohttp")
+    from bot.utils.code_detection import CodeDetector
+    detector = CodeDetector()
     
-    tests = [
-        ("Module Imports", test_imports),
-        ("Warning System", test_warning_system),
-        ("Code Detection", test_code_detection),
-        ("Error Recovery", test_error_recovery)
+    # Test various code samples
+    test_cases = [
+        ("Normal text", "Hello everyone, how are you today?", False),
+        ("Python code", "def hello():\n    print('world')\n    return True", True),
+        ("JavaScript", "function test() {\n    console.log('test');\n    return false;\n}", True),
+        ("Conversation with 'if'", "If you have any questions, let me know", False)
     ]
     
-    passed = 0
-    total = len(tests)
+    for name, text, expected in test_cases:
+        result = detector.detect_code_in_text(text)
+        assert result == expected, f"{name}: {'Detected' if result else 'Not detected'}"
     
-    for test_name, test_func in tests:
-        try:
-            if test_func():
-                passed += 1
-        except Exception as e:
-            print(f"\n❌ {test_name} failed with exception: {e}")
+    # Without Tesseract the detector must not claim OCR support
+    assert not CodeDetector(tesseract_available=False).is_ocr_available()
+
+def test_ocr_available_with_tesseract():
+    """With Tesseract installed the detector reports OCR as available"""
+    pytest.importorskip("aiohttp")
+    pytest.importorskip("pytesseract")
+    if shutil.which("tesseract") is None:
+        pytest.skip("Tesseract is not installed")
+    from bot.utils.code_detection import CodeDetector
+    
+    assert CodeDetector().is_ocr_available()
+
+def test_code_detection_long_unclosed_call():
+    """A long unclosed call is plain text, and no syntax pattern can backtrack on it"""
+    pytest.importorskip("aiohttp")
+    from bot.utils.code_detection import CODE_PATTERNS, CodeDetector
     
-    print(f"\n📊 Test Results: {passed}/{total} tests passed")
+    assert not CodeDetector().detect_code_in_text("f(" + "a" * 5000)
     
-    if passed == total:
-        print("🎉 All tests passed! The organized structure is working correctly.")
-        return True
-    else:
-        print("⚠️ Some tests failed. Check the output above for details.")
-        return False
+    # \w quantifiers separated only by optional whitespace split a word every possible
+    # way before failing, which is what made the old call pattern blow up
+    nested = re.compile(r'\\w[*+](?:\\s[*+])?\\w[*+]')
+    assert not [pattern for pattern in CODE_PATTERNS if nested.search(pattern)]
 
-if __name__ == "__main__":
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+def test_error_recovery(monkeypatch, warning_sys):
+    """Test error recovery system (basic functionality)"""
+    pytest.importorskip("discord")
+    
+    # Set up fake environment for this test only
+    monkeypatch.setenv('DISCORD_TOKEN', 'fake_token')
+    
+    from bot.error_recovery import ErrorRecoverySystem
+    
+    # Create mock bot object
+    class MockBot:
+        pass
+    
+    mock_bot = MockBot()
+    error_recovery = ErrorRecoverySystem(mock_bot, warning_sys)
+    
+    # Test basic functionality
+    assert error_recovery.max_reconnect_attempts > 0
+    assert error_recovery.reconnect_delay > 0
+    
+    # Test reset function
+    error_recovery.reset_reconnect_counter()
+    assert error_recovery.reconnect_attempts == 0
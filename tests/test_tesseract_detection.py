@@ -3,8 +3,15 @@ Quick test to see if our bot can auto-detect Tesseract
 """
 import os
 import platform
+import functools
 import pytesseract
 
+@functools.lru_cache(maxsize=None)
+def _probe_version(tesseract_cmd):
+    """Get the version of the Tesseract at tesseract_cmd, running it once per command"""
+    pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+    return pytesseract.get_tesseract_version()
+
 def test_tesseract_detection():
     """Test if the bot's Tesseract auto-detection works"""
     
@@ -21,7 +28,6 @@ def test_tesseract_detection():
         possible_paths = [
             r'C:\Program Files\Tesseract-OCR\tesseract.exe',
             r'C:\Users\{}\AppData\Local\Programs\Tesseract-OCR\tesseract.exe'.format(os.getenv('USERNAME', '')),
-            'tesseract'  # If in PATH
         ]
         
         for path in possible_paths:
@@ -29,24 +35,22 @@ def test_tesseract_detection():
                 pytesseract.pytesseract.tesseract_cmd = path
                 print(f"✅ Configured Tesseract for Windows: {path}")
                 break
-            elif path == 'tesseract':
-                try:
-                    # Test if tesseract command works
-                    version = pytesseract.get_tesseract_version()
-                    pytesseract.pytesseract.tesseract_cmd = path
-                    print(f"✅ Configured Tesseract for Windows: {path} (in PATH)")
-                    break
-                except:
-                    continue
         else:
-            print("❌ Tesseract not found on Windows. Image detection will be disabled.")
-            return False
+            # Only run tesseract from PATH once no install directory has it
+            try:
+                # Test if tesseract command works
+                _probe_version('tesseract')
+                print("✅ Configured Tesseract for Windows: tesseract (in PATH)")
+            except Exception:
+                print("❌ Tesseract not found on Windows. Image detection will be disabled.")
+                return False
     else:
         print(f"Unknown system: {system}. Using default Tesseract configuration.")
     
     # Test if it works
     try:
-        version = pytesseract.get_tesseract_version()
+        # Free if the PATH probe above already ran it
+        version = _probe_version(pytesseract.pytesseract.tesseract_cmd)
         print(f"🎉 Tesseract working! Version: {version}")
         return True
     except Exception as e:
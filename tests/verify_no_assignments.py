@@ -1,13 +1,51 @@
 #!/usr/bin/env python3
 """
 Simple test to verify no assignments message improvements.
+
+The message text itself is checked on every commit by the pre-commit hook in
+scripts/check_assignment_strings.sh; this script reads the same string list from
+scripts/check_assignment_strings.txt and adds the full report.
 """
 
 import sys
-import os
+import re
+import mmap
+from collections import Counter
+from pathlib import Path
+
+# The pre-commit hook's list of expected strings, shared so the two checks agree
+STRINGS_FILE = Path(__file__).resolve().parent.parent / 'scripts' / 'check_assignment_strings.txt'
+
+def load_expected_strings(path=STRINGS_FILE):
+    """Read the expected strings, grouped by the first word of the comment above them"""
+    groups = {}
+    strings = None
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if line.startswith('#'):
+                strings = groups.setdefault(line.lstrip('# ').split(' ', 1)[0].rstrip(':'), [])
+            elif line and strings is not None:
+                strings.append(line)
+    return {name: tuple(strings) for name, strings in groups.items() if strings}
+
+EXPECTED_GROUPS = load_expected_strings()
 
-# Add project root to Python path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Expected text for each command's improved message
+LIST_IMPROVEMENTS = EXPECTED_GROUPS['!assignments']
+ALL_IMPROVEMENTS = EXPECTED_GROUPS['!all_assignments']
+NEXT_IMPROVEMENTS = EXPECTED_GROUPS['!next_assignment']
+
+# Green color used for positive messages
+GREEN_COLOR, = EXPECTED_GROUPS['colors']
+
+EMOJIS = ('🎉', '😊', '🌟', '👑', '🔍', '💡')
+
+# Every string checked for, as one alternation so the file is scanned once. Each
+# match is a lookahead, so overlapping occurrences are all counted. The pattern is
+# UTF-8 bytes so it can search the memory-mapped file without decoding it
+EXPECTED_STRINGS = LIST_IMPROVEMENTS + ALL_IMPROVEMENTS + NEXT_IMPROVEMENTS + (GREEN_COLOR,) + EMOJIS
+EXPECTED_PATTERN = re.compile(b'(?=(' + b'|'.join(re.escape(s.encode('utf-8')) for s in EXPECTED_STRINGS) + b'))')
 
 def test_message_content():
     """Test that the improved messages are in the code."""
@@ -16,24 +54,17 @@ def test_message_content():
     print("=" * 60)
     
     try:
-        # Read the assignment commands file
-        with open('src/bot/assignment_commands.py', 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Map the assignment commands file and count how often each expected string
+        # occurs; only the matches are decoded
+        with open('src/bot/assignment_commands.py', 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+            found = Counter(match.decode('utf-8') for match in EXPECTED_PATTERN.findall(content))
         
         # Test 1: Check for improved list_assignments message
         print("\n1. Testing list_assignments improvements:")
         
-        improvements = [
-            "Great news! No assignments are due",  # Positive message
-            "For Admins",  # Admin-specific help
-            "Enjoy the Break!",  # Student encouragement  
-            "Add an assignment:",  # Admin instructions
-            "Review previous material",  # Student suggestions
-            "Check Different Time Ranges",  # Navigation help
-        ]
-        
-        for improvement in improvements:
-            if improvement in content:
+        for improvement in LIST_IMPROVEMENTS:
+            if found[improvement]:
                 print(f"   ✅ Found: '{improvement}'")
             else:
                 print(f"   ❌ Missing: '{improvement}'")
@@ -41,17 +72,8 @@ def test_message_content():
         # Test 2: Check for improved all_assignments message
         print("\n2. Testing all_assignments improvements:")
         
-        all_improvements = [
-            "Get Started",  # Admin help
-            "Create your first assignment:",  # Clear instructions
-            "Setup Reminders",  # Reminder setup help
-            "Nothing Here Yet",  # Student message
-            "Your instructor hasn't added",  # Clear explanation
-            "In the meantime:",  # Helpful suggestions
-        ]
-        
-        for improvement in all_improvements:
-            if improvement in content:
+        for improvement in ALL_IMPROVEMENTS:
+            if found[improvement]:
                 print(f"   ✅ Found: '{improvement}'")
             else:
                 print(f"   ❌ Missing: '{improvement}'")
@@ -59,16 +81,8 @@ def test_message_content():
         # Test 3: Check for improved next_assignment message
         print("\n3. Testing next_assignment improvements:")
         
-        next_improvements = [
-            "You're all caught up!",  # Positive message
-            "Admin Options",  # Admin-specific help
-            "Great Work!",  # Student encouragement
-            "Use this time wisely:",  # Constructive suggestions
-            "Check for More",  # Navigation options
-        ]
-        
-        for improvement in next_improvements:
-            if improvement in content:
+        for improvement in NEXT_IMPROVEMENTS:
+            if found[improvement]:
                 print(f"   ✅ Found: '{improvement}'")
             else:
                 print(f"   ❌ Missing: '{improvement}'")
@@ -76,7 +90,7 @@ def test_message_content():
         # Test 4: Check for color improvements
         print("\n4. Testing color improvements:")
         
-        color_count = content.count('color=0x00ff00')  # Green color for positive messages
+        color_count = found[GREEN_COLOR]  # Green color for positive messages
         if color_count >= 2:  # Should be at least 2 green messages
             print(f"   ✅ Found {color_count} positive (green) color messages")
         else:
@@ -85,11 +99,7 @@ def test_message_content():
         # Test 5: Check for emoji improvements
         print("\n5. Testing emoji improvements:")
         
-        emojis = ['🎉', '😊', '🌟', '👑', '🔍', '💡']
-        emoji_count = 0
-        for emoji in emojis:
-            if emoji in content:
-                emoji_count += 1
+        emoji_count = sum(1 for emoji in EMOJIS if found[emoji])
         
         print(f"   ✅ Found {emoji_count}/6 improved emojis")
         
@@ -98,8 +108,9 @@ def test_message_content():
         print("📊 VERIFICATION SUMMARY")
         print("=" * 60)
         
-        total_improvements = len(improvements) + len(all_improvements) + len(next_improvements)
-        found_improvements = sum(1 for imp in improvements + all_improvements + next_improvements if imp in content)
+        all_expected = LIST_IMPROVEMENTS + ALL_IMPROVEMENTS + NEXT_IMPROVEMENTS
+        total_improvements = len(all_expected)
+        found_improvements = sum(1 for imp in all_expected if found[imp])
         
         print(f"Content Improvements: {found_improvements}/{total_improvements}")
         print(f"Color Improvements: {'✅' if color_count >= 2 else '❌'}")